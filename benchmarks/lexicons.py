@@ -0,0 +1,61 @@
+"""Generated Lexicons and timing helpers shared by the benchmarks"""
+
+import random
+import time
+import uuid
+from typing import Any, Callable
+
+TYPES: tuple[str, ...] = ("Noun", "Verb", "Adjective", "Adverb", "Idiom")
+TAGS: tuple[str, ...] = ("family", "tech", "food", "travel", "work")
+LETTERS: str = "abcdefghijklmnopqrstuvwxyzäöüß"
+
+
+def make_lexicon(size: int, seed: int = 0) -> dict:
+    """Generate a Lexicon with `size` words in the format of the Lexicon files
+
+    Parameters
+    ----------
+    size : int
+        Number of words
+    seed : int, optional
+        Seed of the random generator, by default 0
+
+    Returns
+    -------
+    dict
+        Lexicon data
+    """
+    rnd = random.Random(seed)
+
+    def text(words: int) -> str:
+        return " ".join(
+            "".join(rnd.choices(LETTERS, k=rnd.randint(3, 9))) for _ in range(words)
+        )
+
+    return {
+        "id": uuid.UUID(int=rnd.getrandbits(128)).hex,
+        "name": f"Benchmark {size}",
+        "words": [
+            {
+                "id": id_,
+                "word": text(1),
+                "translations": [text(rnd.randint(1, 3)) for _ in range(2)],
+                "pronunciation": text(1),
+                "types": rnd.sample(TYPES, rnd.randint(0, 2)),
+                "examples": [text(8) for _ in range(rnd.randint(0, 2))],
+                "references": rnd.sample(range(size), min(size, rnd.randint(0, 2))),
+                "tags": rnd.sample(TAGS, rnd.randint(0, 2)),
+            }
+            for id_ in range(size)
+        ],
+    }
+
+
+def best_of(repeat: int, func: Callable, *args: Any) -> float:
+    """Return the shortest time of `repeat` calls of `func(*args)`, in seconds"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
@@ -0,0 +1,98 @@
+"""Benchmark of the peak memory of loading a Lexicon file as a tree and streamed
+
+Every measurement runs in a fresh process, so the peak RSS isn't affected by the
+previous ones. Run from the repository root:
+
+::
+
+    python3 benchmarks/memory.py [--sizes 10000 100000]
+"""
+
+import argparse
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+# pylint: disable=wrong-import-position
+from lexicons import make_lexicon
+
+from lexi.utils import serialization
+
+SIZES: tuple[int, ...] = (10_000, 100_000)
+METHODS: tuple[str, ...] = ("load", "load_streamed")
+
+
+def measure(method: str, path: str) -> None:
+    """Load the file at `path` with `method` and print the measurements
+
+    Printed values are the growth of the peak RSS during the load and the load time
+    """
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    with open(path, "r", encoding="utf-8") as file:
+        if method == "load":
+            serialization.load(file)
+        else:
+            serialization.load_streamed(file, "words")
+    elapsed = time.perf_counter() - start
+    # ru_maxrss is in kilobytes on Linux
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - rss_before
+    print(rss / 1024, elapsed)
+
+
+def write_lexicon(size: int, path: str) -> None:
+    """Write a generated Lexicon of `size` words to `path`"""
+    with open(path, "w", encoding="utf-8") as file:
+        serialization.dump(make_lexicon(size), file)
+
+
+def run_child(*args: str) -> str:
+    """Run this script with `args` in a new process and return its output"""
+    return subprocess.run(
+        (sys.executable, __file__, *args),
+        capture_output=True,
+        check=True,
+        encoding="utf-8",
+    ).stdout
+
+
+def main() -> None:
+    """Run the benchmark and print a table with the results"""
+    # The peak RSS of a forked process starts at the one of its parent, so the
+    # parent process never holds the generated Lexicons itself
+    if len(sys.argv) == 4 and sys.argv[1] == "--write":
+        write_lexicon(int(sys.argv[2]), sys.argv[3])
+        return
+    if len(sys.argv) == 4 and sys.argv[1] == "--measure":
+        measure(sys.argv[2], sys.argv[3])
+        return
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES)
+    args = parser.parse_args()
+
+    print(
+        f"{'words':>8} {'file, MiB':>10} {'method':>14} {'peak RSS, MiB':>14}"
+        f" {'time, s':>8}"
+    )
+    for size in args.sizes:
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "lexicon.yaml")
+            run_child("--write", str(size), path)
+            mib = os.path.getsize(path) / 1024 / 1024
+            for method in METHODS:
+                output = run_child("--measure", method, path)
+                rss, elapsed = (float(value) for value in output.split())
+                print(
+                    f"{size:>8} {mib:>10.2f} {method:>14} {rss:>14.1f}"
+                    f" {elapsed:>8.2f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
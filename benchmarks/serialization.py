@@ -0,0 +1,55 @@
+"""Benchmark of the YAML load/dump throughput of the libyaml and pure Python paths
+
+Run from the repository root:
+
+::
+
+    python3 benchmarks/serialization.py [--sizes 1000 10000 100000] [--repeat 3]
+"""
+
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+# pylint: disable=wrong-import-position
+from lexicons import best_of, make_lexicon
+
+from lexi.utils import serialization
+
+SIZES: tuple[int, ...] = (1_000, 10_000, 100_000)
+
+
+def main() -> None:
+    """Run the benchmark and print a table with the results"""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    paths = [("pure", True)]
+    if serialization.LIBYAML:
+        paths.append(("libyaml", False))
+    else:
+        print("libyaml is not available, only the pure Python path is measured")
+
+    print(
+        f"{'words':>8} {'path':>8} {'size, MiB':>10} {'load, s':>9} {'load, MiB/s':>12}"
+        f" {'dump, s':>9} {'dump, MiB/s':>12}"
+    )
+    for size in args.sizes:
+        data = make_lexicon(size)
+        document = serialization.dump(data)
+        mib = len(document.encode("utf-8")) / 1024 / 1024
+        for name, pure in paths:
+            load = best_of(args.repeat, serialization.load, document, pure)
+            dump = best_of(args.repeat, serialization.dump, data, None, pure)
+            print(
+                f"{size:>8} {name:>8} {mib:>10.2f} {load:>9.3f} {mib / load:>12.2f}"
+                f" {dump:>9.3f} {mib / dump:>12.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Benchmark of sequential and parallel parsing of Lexicon files on startup
+
+Every combination of file count and file size is written to a temporary directory
+and parsed sequentially and with `lexi.utils.parallel.parse_files`. Run from the
+repository root:
+
+::
+
+    python3 benchmarks/startup.py [--files 4 16 32] [--sizes 1000 10000] [--workers 0]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+# pylint: disable=wrong-import-position
+from lexicons import best_of, make_lexicon
+
+from lexi.utils import parallel, serialization
+
+FILES: tuple[int, ...] = (4, 16, 32)
+SIZES: tuple[int, ...] = (1_000, 10_000)
+
+
+def write_lexicons(directory: str, files: int, size: int) -> list[str]:
+    """Write `files` generated Lexicons of `size` words to `directory`
+
+    Returns
+    -------
+    list[str]
+        Paths of the written files
+    """
+    paths = []
+    for seed in range(files):
+        path = os.path.join(directory, f"{seed}.yaml")
+        with open(path, "w", encoding="utf-8") as file:
+            serialization.dump(make_lexicon(size, seed), file)
+        paths.append(path)
+    return paths
+
+
+def main() -> None:
+    """Run the benchmark and print a table with the results"""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--files", type=int, nargs="+", default=FILES)
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES)
+    parser.add_argument(
+        "--workers", type=int, default=0, help="0 for one worker per CPU"
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(
+        f"{'files':>6} {'words':>8} {'workers':>8} {'sequential, s':>14}"
+        f" {'parallel, s':>12} {'speedup':>8}"
+    )
+    for files in args.files:
+        for size in args.sizes:
+            with tempfile.TemporaryDirectory() as directory:
+                paths = write_lexicons(directory, files, size)
+                sequential = best_of(args.repeat, parallel.parse_files, paths, 1)
+                parallel_ = best_of(
+                    args.repeat, parallel.parse_files, paths, args.workers
+                )
+            workers = parallel.workers_count(args.workers, files)
+            print(
+                f"{files:>6} {size:>8} {workers:>8} {sequential:>14.3f}"
+                f" {parallel_:>12.3f} {sequential / parallel_:>7.2f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -102,6 +102,42 @@ class WindowState(Enum):
     WORDS = 2
 
 
+class FsyncPolicy(str, Enum):
+    """Enum class for the `fsync-policy` setting values
+
+    ::
+
+        ALWAYS -> "Sync every written file and its directory immediately"
+        BATCHED -> "Sync files written in a batch together, when the batch ends"
+        NEVER -> "Leave syncing to the operating system"
+    """
+
+    ALWAYS = "always"
+    BATCHED = "batched"
+    NEVER = "never"
+
+    def __str__(self) -> str:
+        return self.value
+
+
+class StorageBackend(str, Enum):
+    """Enum class for the `storage-backend` setting values
+
+    ::
+
+        YAML -> "Rewrite the whole Lexicon file on every save"
+        JOURNAL -> "Append changes to a journal, folded into the Lexicon file later"
+        SQLITE -> "Keep all Lexicons in a single SQLite database"
+    """
+
+    YAML = "yaml"
+    JOURNAL = "journal"
+    SQLITE = "sqlite"
+
+    def __str__(self) -> str:
+        return self.value
+
+
 # pylint: disable=invalid-name
 class Schema:
     """Enum for all Lexi gschema values
@@ -109,6 +145,14 @@ class Schema:
     ::
 
         USE_DEBUG_LOG() : bool
+        SAVE_ON_EXIT() : bool
+        SAVE_DELAY() : int
+        SAVE_MAX_DELAY() : int
+        FSYNC_POLICY() : FsyncPolicy
+        STORAGE_BACKEND() : StorageBackend
+        LOAD_WORKERS() : int
+        WATCH_LEXICONS() : bool
+        FUZZY_DISTANCE() : int
     """
 
     @staticmethod
@@ -118,3 +162,31 @@ class Schema:
     @staticmethod
     def SAVE_ON_EXIT() -> bool:
         return shared.schema.get_boolean("save-on-exit")
+
+    @staticmethod
+    def SAVE_DELAY() -> int:
+        return shared.schema.get_int("save-delay")
+
+    @staticmethod
+    def SAVE_MAX_DELAY() -> int:
+        return shared.schema.get_int("save-max-delay")
+
+    @staticmethod
+    def FSYNC_POLICY() -> FsyncPolicy:
+        return FsyncPolicy(shared.schema.get_string("fsync-policy"))
+
+    @staticmethod
+    def STORAGE_BACKEND() -> StorageBackend:
+        return StorageBackend(shared.schema.get_string("storage-backend"))
+
+    @staticmethod
+    def LOAD_WORKERS() -> int:
+        return shared.schema.get_int("load-workers")
+
+    @staticmethod
+    def WATCH_LEXICONS() -> bool:
+        return shared.schema.get_boolean("watch-lexicons")
+
+    @staticmethod
+    def FUZZY_DISTANCE() -> int:
+        return shared.schema.get_int("fuzzy-distance")
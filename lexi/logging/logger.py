@@ -1,10 +1,13 @@
 import logging
 import os
 import platform
+import resource
 import subprocess
 import sys
+from typing import Union
 
 from lexi import enums, shared
+from lexi.utils import serialization
 
 log_dir = os.path.join(shared.cache_dir, "lexi", "logs")
 log_filename = os.path.join(log_dir, "lexi.log")
@@ -33,10 +36,14 @@ logger = logging.getLogger("lexi")
 
 def log_system_info() -> None:
     """Log system information."""
-    open(log_filename, "a", encoding="utf-8").truncate(0)
+    with open(log_filename, "a", encoding="utf-8") as file:
+        file.truncate(0)
     logger.info("Logging started")
     logger.info("Starting Lexi %s v%s", shared.PREFIX, shared.VERSION)
     logger.debug("Python version: %s", sys.version)
+    logger.debug(
+        "YAML backend: %s", "libyaml" if serialization.LIBYAML else "pure Python"
+    )
     if os.getenv("FLATPAK_ID") == shared.PREFIX:
         process = subprocess.run(
             ("flatpak-spawn", "--host", "flatpak", "--version"),
@@ -46,4 +53,21 @@ def log_system_info() -> None:
         )
         logger.debug("Flatpak version: %s", process.stdout.rstrip())
     logger.info("Platform: %s", platform.platform())
+    logger.debug("File descriptors limit: %d", fd_limit())
     logger.info("-" * 37)
+
+
+def open_fd_count() -> Union[int, None]:
+    """Return the number of file descriptors open by the app, None if unknown"""
+    for fd_dir in ("/proc/self/fd", "/dev/fd"):
+        try:
+            # Listing the directory opens one more descriptor for the listing itself
+            return len(os.listdir(fd_dir)) - 1
+        except OSError:
+            continue
+    return None
+
+
+def fd_limit() -> int:
+    """Return the soft limit of the file descriptors open by the app"""
+    return resource.getrlimit(resource.RLIMIT_NOFILE)[0]
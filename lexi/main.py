@@ -2,7 +2,6 @@ import os
 import sys
 
 import gi
-import yaml
 
 gi.require_version("Gtk", "4.0")
 gi.require_version("Adw", "1")
@@ -11,7 +10,15 @@ gi.require_version("Adw", "1")
 from gi.repository import Adw, Gdk, Gio, GLib, Gtk
 
 from lexi import enums, shared
-from lexi.logging.logger import log_filename, log_system_info, logger, prev_log_filename
+from lexi.logging.logger import (
+    fd_limit,
+    log_filename,
+    log_system_info,
+    logger,
+    open_fd_count,
+    prev_log_filename,
+)
+from lexi.utils import durable, serialization
 from lexi.utils.backend import LexiconController
 from lexi.window import LexiWindow
 
@@ -73,6 +80,14 @@ class LexiApplication(Adw.Application):
         sort_type.connect("activate", shared.win.on_sorting_type_changed)
         shared.win.add_action(sort_type)
 
+        type_filter_mode = Gio.SimpleAction.new_stateful(
+            "type_filter_mode",
+            GLib.VariantType.new("s"),
+            GLib.Variant("s", shared.state_schema.get_string("type-filter-mode")),
+        )
+        type_filter_mode.connect("activate", shared.win.on_type_filter_mode_changed)
+        shared.win.add_action(type_filter_mode)
+
         shared.state_schema.bind(
             "window-width", shared.win, "default-width", Gio.SettingsBindFlags.DEFAULT
         )
@@ -91,19 +106,20 @@ class LexiApplication(Adw.Application):
     def do_shutdown(self):  # pylint: disable=arguments-differ
         """Action emitted on app close"""
         logger.info("Saving config file before exit")
-        shared.config_file.seek(0)
-        shared.config_file.truncate(0)
-        yaml.dump(
-            shared.config,
-            shared.config_file,
-            sort_keys=False,
-            encoding=None,
-            allow_unicode=True,
-        )
-        if enums.Schema.SAVE_ON_EXIT():
-            logger.info("Saving Lexicons on exit")
-            for lexicon in shared.lexictrl:
-                lexicon._save()  # pylint: disable=protected-access
+        with durable.batch():
+            durable.write(
+                os.path.join(shared.data_dir, "config.yaml"),
+                serialization.dump(shared.config),
+            )
+            if shared.lexictrl.save_scheduler.pending:
+                logger.info("Flushing pending Lexicon saves")
+                shared.lexictrl.save_scheduler.flush()
+            if enums.Schema.SAVE_ON_EXIT():
+                logger.info("Saving Lexicons on exit")
+                for lexicon in shared.lexictrl:
+                    lexicon._save()  # pylint: disable=protected-access
+        # Blocks until the background writer has written every submitted snapshot
+        shared.lexictrl.close()
 
     def create_actions(self, actions: set) -> None:
         """Creates actions for provided scope with provided accels
@@ -137,12 +153,17 @@ class LexiApplication(Adw.Application):
         def get_debug_info() -> str:
             """Get debug info"""
             prev_log = ""
-            current_log = open(log_filename, "r", encoding="utf-8").read()
+            with open(log_filename, "r", encoding="utf-8") as f:
+                current_log = f.read()
             if os.path.exists(prev_log_filename):
                 with open(prev_log_filename, "r", encoding="utf-8") as f:
                     prev_log = f.read()
+            fds = f"OPEN FILE DESCRIPTORS: {open_fd_count()} of {fd_limit()}"
 
-            return f"PREVIOUS RUN LOG\n\n{prev_log}\n\nCURRENT RUN LOG\n\n{current_log}"
+            return (
+                f"{fds}\n\nPREVIOUS RUN LOG\n\n{prev_log}"
+                f"\n\nCURRENT RUN LOG\n\n{current_log}"
+            )
 
         dialog = Adw.AboutDialog.new_from_appdata(
             shared.PREFIX + "/" + shared.APP_ID + ".metainfo.xml", shared.VERSION
@@ -198,24 +219,19 @@ def main(_version):
     if not os.path.exists(os.path.join(shared.data_dir, "config.yaml")):
         with open(os.path.join(shared.data_dir, "config.yaml"), "x+") as f:
             logger.info("Creating config.yaml file")
-            yaml.dump(
+            serialization.dump(
                 {
                     "word-types": [],
                     "enabled-types": [],
                     "version": shared.CACHEV,
                 },
                 f,
-                sort_keys=False,
-                encoding=None,
-                allow_unicode=True,
             )
 
     # Load config file and config dict to the shared data
     logger.info("Loading config")
-    shared.config_file = open(
-        os.path.join(shared.data_dir, "config.yaml"), "r+", encoding="utf-8"
-    )
-    shared.config = yaml.safe_load(shared.config_file)
+    with open(os.path.join(shared.data_dir, "config.yaml"), "r", encoding="utf-8") as f:
+        shared.config = serialization.load(f)
 
     # Migrate config file and lexicons to newer versions if their structure has changed
     if shared.config["version"] < shared.CACHEV:
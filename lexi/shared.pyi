@@ -1,5 +1,3 @@
-from typing import TextIO
-
 from gi.repository import Gio
 
 from lexi.main import LexiApplication
@@ -20,7 +18,6 @@ state_schema: Gio.Settings
 app: LexiApplication
 win: LexiWindow
 lexictrl: LexiconController
-config_file: TextIO
 config: dict[int, list[str]]
 
 # Handler IDs for connections
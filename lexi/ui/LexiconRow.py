@@ -3,10 +3,13 @@ from gi.repository import Adw, Gio, Gtk
 from lexi import enums, shared
 from lexi.logging.logger import logger
 from lexi.ui.WordRow import WordRow
-from lexi.utils.backend import Lexicon
+from lexi.utils.backend import Lexicon, Word
 
 gtc = Gtk.Template.Child  # pylint: disable=invalid-name
 
+# Number of the existing words suggested while typing a new word
+COMPLETION_LIMIT = 5
+
 
 # pylint: disable=unused-private-member
 @Gtk.Template(resource_path=shared.PREFIX + "/gtk/ui/LexiconRow.ui")
@@ -18,6 +21,8 @@ class LexiconRow(Gtk.Box):
     word_entry_row: Adw.EntryRow = gtc()
     translation_entry_row: Adw.EntryRow = gtc()
     example_entry_row: Adw.EntryRow = gtc()
+    word_exists_label: Gtk.Label = gtc()
+    completions_list_box: Gtk.ListBox = gtc()
     actions_popover: Gtk.Popover = gtc()
     rename_alert_dialog: Adw.AlertDialog = gtc()
     rename_entry: Gtk.Entry = gtc()
@@ -28,6 +33,8 @@ class LexiconRow(Gtk.Box):
 
         self.title.set_label(lexicon.name)
         self.lexicon = lexicon
+        # Words shown in the completions list box, in the order of its rows
+        self._completions: list[Word] = []
         self.lexicon.connect(
             "notify::name", lambda *_: self.title.set_label(lexicon.name)
         )
@@ -136,6 +143,8 @@ class LexiconRow(Gtk.Box):
     def check_if_word_is_empty(self, row: Adw.EntryRow) -> None:
         """Check if the word entry is empty and apply error styling.
 
+        Also suggests the existing words starting with the entered text.
+
         Parameters
         ----------
         row : Adw.EntryRow
@@ -145,6 +154,53 @@ class LexiconRow(Gtk.Box):
             row.add_css_class("error")
         else:
             row.remove_css_class("error")
+        self.__update_completions(row.get_text())
+
+    def __update_completions(self, text: str) -> None:
+        """Show the existing words starting with the text and warn about duplicates.
+
+        Parameters
+        ----------
+        text : str
+            Text of the word entry.
+        """
+        exists = text != "" and self.lexicon.indexes.has_word(text)
+        self.word_exists_label.set_visible(exists)
+        if exists:
+            self.word_entry_row.add_css_class("warning")
+        else:
+            self.word_entry_row.remove_css_class("warning")
+
+        self.completions_list_box.remove_all()
+        words = (
+            self.lexicon.indexes.complete_word(text, COMPLETION_LIMIT) if text else []
+        )
+        self._completions = words
+        for word in words:
+            row = Adw.ActionRow(
+                title=word.word.replace("&rtl", ""), use_markup=False, activatable=True
+            )
+            if word.translations:
+                row.set_subtitle(word.translations[0].replace("&rtl", ""))
+            self.completions_list_box.append(row)
+        self.completions_list_box.set_visible(bool(words))
+
+    @Gtk.Template.Callback()
+    def on_completion_activated(
+        self, _list_box: Gtk.ListBox, row: Adw.ActionRow
+    ) -> None:
+        """Complete the word entry with the activated existing word.
+
+        Parameters
+        ----------
+        _list_box : Gtk.ListBox
+            The list box with the suggested words.
+        row : Adw.ActionRow
+            The activated row.
+        """
+        # The title lacks the RTL marker of the word
+        self.word_entry_row.set_text(self._completions[row.get_index()].word)
+        self.word_entry_row.set_position(-1)
 
     @Gtk.Template.Callback()
     def on_add_word_dialog_enter_press(self, *_args) -> None:
@@ -168,7 +224,7 @@ class LexiconRow(Gtk.Box):
         if len(example) == 0:
             example = []
 
-        id_ = max((w.id for w in self.lexicon.words), default=0) + 1
+        id_ = self.lexicon.new_word_id()
         new_word: dict = {
             "id": id_,
             "word": word,
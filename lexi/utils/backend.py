@@ -1,48 +1,316 @@
 """Module, providing backend classes for Lexi (Word, Lexicon)"""
 
+import bisect
 import os
-import uuid
 from pathlib import Path
 from typing import Iterator, Self, Union
 
-import yaml
 from gi.repository import GObject
 
 from lexi import enums, shared
-from lexi.logging.logger import logger
+from lexi.logging.logger import logger, open_fd_count
+from lexi.utils import durable, parse_cache, search, serialization, shards, storage
+from lexi.utils.database import Database
+from lexi.utils.lexicon_index import LexiconIndex
+from lexi.utils.monitor import LexiconsMonitor
+from lexi.utils.save_scheduler import SaveScheduler
+from lexi.utils.word_indexes import WordIndexes, types_mask
+from lexi.utils.writer import Writer
 
 
-class LexiconController:
+# pylint: disable=too-many-instance-attributes
+class LexiconController(GObject.Object):
+    """Keeps all Lexicons of the app
+
+    Lexicons are kept by their ids and iterated in the order of their names. The
+    order is maintained on adding, removing and renaming Lexicons, so it's never
+    sorted as a whole
+
+    With the file storage backends the lexicons directory is watched, so Lexicon
+    files created, changed or removed by other programs are reloaded one by one::
+
+        lexicon-added (Lexicon) -> a new Lexicon file appeared
+        lexicon-removed (Lexicon) -> the file of a Lexicon was removed
+        lexicon-reloaded (Lexicon, list[Word], list[Word], list[Word]) -> the file of
+            a Lexicon changed, with the added, changed and removed words
+    """
+
     __gtype_name__ = "LexiconController"
 
+    __gsignals__ = {
+        "lexicon-added": (GObject.SignalFlags.RUN_FIRST, None, (object,)),
+        "lexicon-removed": (GObject.SignalFlags.RUN_FIRST, None, (object,)),
+        "lexicon-reloaded": (
+            GObject.SignalFlags.RUN_FIRST,
+            None,
+            (object, object, object, object),
+        ),
+    }
+
     def __init__(self) -> None:
-        self._lexicons: list[Lexicon] = []
+        super().__init__()
+        self._lexicons: dict[str, Lexicon] = {}
+        # Lexicons sorted by their names and the sort keys they're sorted with
+        self._ordered: list[Lexicon] = []
+        self._keys: list[tuple[str, str]] = []
+        # Sort keys of the Lexicons by their ids
+        self._placed: dict[str, tuple[str, str]] = {}
+        self.save_scheduler = SaveScheduler()
+        self.writer = Writer()
+        self.database: Database = None
+        self.index: LexiconIndex = None
+        self.monitor: LexiconsMonitor = None
 
         self.__populate_lexicons()
+        logger.debug(
+            "Loaded %d lexicons, %s file descriptors open",
+            len(self._lexicons),
+            open_fd_count(),
+        )
 
     def __iter__(self) -> Iterator["Lexicon"]:
-        """Iterate over the lexicons"""
-        return iter(self._lexicons)
+        """Iterate over the lexicons in the order of their names"""
+        return iter(self._ordered)
 
     def __len__(self) -> int:
         """Return the number of lexicons"""
         return len(self._lexicons)
 
-    def __populate_lexicons(self) -> None:
-        """Populate the lexicons list with the lexicons from the data directory"""
-        for file in os.listdir(os.path.join(shared.data_dir, "lexicons")):
-            if file.endswith(".yaml"):
-                lexicon = Lexicon.from_str(
-                    os.path.join(shared.data_dir, "lexicons", file)
-                )
-                self._lexicons.append(lexicon)
+    def __contains__(self, lexicon: "Lexicon") -> bool:
+        """Return whether the lexicon is kept by the controller"""
+        return self._lexicons.get(lexicon.id) is lexicon
+
+    def __add(self, lexicon: "Lexicon") -> bool:
+        """Keep a Lexicon, placing it in the order of names
+
+        Returns
+        -------
+        bool
+            `False` if another Lexicon with the same id is kept already
+        """
+        if lexicon.id in self._lexicons:
+            logger.warning(
+                "Skipping “%s”, lexicon with id “%s” already exists",
+                lexicon.path[1],
+                lexicon.id,
+            )
+            return False
+        self._lexicons[lexicon.id] = lexicon
+        self.__insert_ordered(lexicon)
+        lexicon.connect("notify::name", self.__on_lexicon_renamed)
+        return True
+
+    def __discard(self, lexicon: "Lexicon") -> None:
+        """Stop keeping a Lexicon"""
+        lexicon.disconnect_by_func(self.__on_lexicon_renamed)
+        del self._lexicons[lexicon.id]
+        self.__remove_ordered(lexicon)
+
+    def __insert_ordered(self, lexicon: "Lexicon") -> None:
+        key = self._placed[lexicon.id] = (lexicon.name, lexicon.id)
+        i = bisect.bisect_left(self._keys, key)
+        self._keys.insert(i, key)
+        self._ordered.insert(i, lexicon)
+
+    def __remove_ordered(self, lexicon: "Lexicon") -> None:
+        # The Lexicon is looked up by the key it was placed with, since it may be
+        # renamed already
+        i = bisect.bisect_left(self._keys, self._placed.pop(lexicon.id))
+        del self._keys[i]
+        del self._ordered[i]
+
+    def __on_lexicon_renamed(self, lexicon: "Lexicon", *_args) -> None:
+        self.__remove_ordered(lexicon)
+        self.__insert_ordered(lexicon)
+
+    def __populate_lexicons(self, previous: dict[str, "Lexicon"] = None) -> None:
+        """Populate the lexicons list with the lexicons from the data directory
+
+        With the `sqlite` storage backend the lexicons are loaded from the database,
+        which is converted from the YAML lexicons on the first start. Switching back
+        to the other backends converts the database to the YAML lexicons again.
+        Otherwise the lexicons are created from the lexicons index, the files of
+        lexicons missing in it are read and indexed
+
+        Parameters
+        ----------
+        previous : dict[str, Lexicon], optional
+            Lexicons without unsaved changes by their file names, kept as they are if
+            their files are unchanged
+        """
+        lexicons_dir = os.path.join(shared.data_dir, "lexicons")
+        database_path = os.path.join(shared.data_dir, "lexicons.db")
+        self.index = LexiconIndex(Path(lexicons_dir, "index"), self.writer)
+        durable.cleanup(lexicons_dir)
+        for directory in Path(lexicons_dir).glob("*" + shards.SHARDS_SUFFIX):
+            durable.cleanup(directory)
+
+        if enums.Schema.STORAGE_BACKEND() == enums.StorageBackend.SQLITE:
+            self.database = Database(database_path)
+            storage.convert_to_sqlite(self.database, lexicons_dir)
+            for header in self.database.lexicons():
+                self.__add(Lexicon(storage.SqliteStorage(self.database, header["id"])))
+            parse_cache.prune(())
+            return
+
+        if os.path.exists(database_path):
+            database = Database(database_path)
+            storage.convert_to_yaml(database, lexicons_dir)
+            database.close()
+            for suffix in ("", "-wal", "-shm"):
+                if os.path.exists(database_path + suffix):
+                    os.remove(database_path + suffix)
+
+        paths = [
+            os.path.join(lexicons_dir, file)
+            for file in os.listdir(lexicons_dir)
+            if file.endswith(".yaml")
+        ]
+        self.index.load()
+        entries = {path: self.index.lookup(path) for path in paths}
+        snapshots = storage.parse_stale(
+            [path for path, entry in entries.items() if entry is None]
+        )
+        previous = previous or {}
+        for path, entry in entries.items():
+            if entry is not None:
+                lexicon = previous.get(os.path.basename(path))
+                if lexicon is not None and lexicon.id == entry["id"]:
+                    logger.debug("Keeping unchanged lexicon “%s”", lexicon.name)
+                else:
+                    lexicon = Lexicon.from_index(path, entry)
+                self.__add(lexicon)
+                continue
+            lexicon = Lexicon.from_str(path, snapshots.get(path))
+            logger.debug("Indexing lexicon “%s”", lexicon.name)
+            self.index.update(path, lexicon.id, lexicon.name, lexicon.word_count)
+            self.__add(lexicon)
+        self.index.prune(paths)
+        parse_cache.prune(lexicon.path[0] for lexicon in self._ordered)
+        if enums.Schema.WATCH_LEXICONS():
+            self.monitor = LexiconsMonitor(lexicons_dir, self.__on_files_changed)
+
+    def __on_files_changed(self, paths: set[str]) -> bool:
+        """Reload the Lexicons of the files changed by other programs
+
+        Returns `False` while the app's own writes are in flight, since the index
+        isn't updated with them yet
+        """
+        if self.writer.busy:
+            return False
+        for path in sorted(paths):
+            try:
+                self.__reload_file(path)
+            except (OSError, serialization.YAMLError, KeyError, TypeError) as e:
+                logger.warning("Failed to reload “%s”: %s", path, e)
+        return True
+
+    def __reload_file(self, path: str) -> None:
+        """Reload the Lexicon of the file at `path` if it's changed by other programs
+
+        Parameters
+        ----------
+        path : str
+            Path of the Lexicon file
+        """
+        lexicon = self.get_lexicon_by_path(path)
+        if not os.path.exists(path):
+            if lexicon is not None:
+                logger.info("Lexicon file “%s” was removed", path)
+                self.__forget_lexicon(lexicon)
+            return
+        # Own writes and touched files match their index entries
+        if self.index.lookup(path) is not None:
+            return
+
+        storage_ = storage.FileStorage(Path(path))
+        if lexicon is not None and storage_.load_header()["id"] == lexicon.id:
+            logger.info("Lexicon file “%s” was changed, reloading", path)
+            added, changed, removed = lexicon.reload(storage_)
+            self.index.update(path, lexicon.id, lexicon.name, lexicon.word_count)
+            self.emit("lexicon-reloaded", lexicon, added, changed, removed)
+            return
+
+        if lexicon is not None:
+            # Replaced by a file of another Lexicon
+            self.__forget_lexicon(lexicon)
+        logger.info("Lexicon file “%s” was added", path)
+        lexicon = Lexicon.from_str(path)
+        self.index.update(path, lexicon.id, lexicon.name, lexicon.word_count)
+        if self.__add(lexicon):
+            self.emit("lexicon-added", lexicon)
+
+    def __forget_lexicon(self, lexicon: "Lexicon") -> None:
+        """Drop a Lexicon whose file is removed, without touching its files"""
+        self.save_scheduler.discard(lexicon)
+        # Queued writes would recreate the files
+        lexicon._storage.discard()  # pylint: disable=protected-access
+        self.__discard(lexicon)
+        self.index.remove(lexicon.path[0])
+        parse_cache.evict(lexicon.path[0])
+        self.emit("lexicon-removed", lexicon)
 
     def regenerate_lexicons(self) -> Self:
-        """Remove all Lexicons from `self._lexicons` and populate it again"""
-        self._lexicons.clear()
-        self.__populate_lexicons()
+        """Remove all Lexicons from the controller and populate it again
+
+        Lexicons without unsaved changes whose files are unchanged are kept without
+        reading their files
+        """
+        previous = {
+            lexicon.path[0].name: lexicon
+            for lexicon in self._ordered
+            if not lexicon.dirty
+        }
+        self.close()
+        for lexicon in list(self._ordered):
+            self.__discard(lexicon)
+        self.__populate_lexicons(previous)
         return self
 
+    def unchanged_since_export(self, checksums: dict[str, str]) -> set[str]:
+        """Return the Lexicon files with the same content as in a backup
+
+        Parameters
+        ----------
+        checksums : dict[str, str]
+            Checksums of the Lexicon files of the backup by the file names
+
+        Returns
+        -------
+        set[str]
+            Names of the Lexicon files without unsaved changes, which were exported
+            with the given checksums and haven't changed since
+        """
+        if enums.Schema.STORAGE_BACKEND() == enums.StorageBackend.SQLITE:
+            return set()
+        # Results of the pending writes drop the exports of the written Lexicons
+        self.writer.drain()
+        unchanged = set()
+        for lexicon in self._ordered:
+            name = lexicon.path[0].name
+            if name not in checksums or lexicon.dirty:
+                continue
+            if self.index.is_exported(lexicon.path[0], checksums[name]):
+                unchanged.add(name)
+        return unchanged
+
+    def close(self) -> None:
+        """Drop pending saves, finish background writes and close the database
+
+        Must be called before the data directory is replaced
+        """
+        if self.monitor is not None:
+            self.monitor.cancel()
+            self.monitor = None
+        self.save_scheduler.discard()
+        # Results of the writes update the index, so it's written last
+        self.writer.drain()
+        self.index.flush()
+        self.writer.drain()
+        if self.database is not None:
+            self.database.close()
+            self.database = None
+
     def add_lexicon(self, name: str) -> Self:
         """Add a new lexicon to the controller
 
@@ -51,8 +319,7 @@ class LexiconController:
         name : str
             Name of the lexicon to add
         """
-        lexicon = Lexicon.for_unexistent(name)
-        self._lexicons.append(lexicon)
+        self.__add(Lexicon.for_unexistent(name))
         return self
 
     def rm_lexicon(self, id_: str) -> "Lexicon":
@@ -73,13 +340,13 @@ class LexiconController:
         ValueError
             If the lexicon is not found
         """
-        for i, lexicon in enumerate(self._lexicons):
-            if lexicon.id == id_:
-                lexicon._file.close()  # pylint: disable=protected-access
-                os.remove(lexicon.path[0])
-                self._lexicons.pop(i)
-                return lexicon
-        raise ValueError("Lexicon not found")
+        lexicon = self._lexicons.get(id_)
+        if lexicon is None:
+            raise ValueError("Lexicon not found")
+        self.save_scheduler.discard(lexicon)
+        lexicon._storage.remove()  # pylint: disable=protected-access
+        self.__discard(lexicon)
+        return lexicon
 
     def get_lexicon(self, id_: str) -> Union["Lexicon", None]:
         """Return the lexicon with the given id
@@ -94,24 +361,69 @@ class LexiconController:
         Lexicon
             Lexicon object if found, None otherwise
         """
-        for lexicon in self._lexicons:
-            if lexicon.id == id_:
+        return self._lexicons.get(id_)
+
+    def get_lexicon_by_path(
+        self, path: Union[str, os.PathLike]
+    ) -> Union["Lexicon", None]:
+        """Return the lexicon stored in the file at `path`
+
+        Parameters
+        ----------
+        path : str | os.PathLike
+            Path of the lexicon file
+
+        Returns
+        -------
+        Lexicon
+            Lexicon object if found, None otherwise
+        """
+        name = Path(path).name
+        for lexicon in self._ordered:
+            if lexicon.path[0].name == name:
                 return lexicon
         return None
 
 
+# pylint: disable=too-many-instance-attributes
 class Lexicon(GObject.Object):
+    """Lexicon with its words
+
+    Only the header of the lexicon is loaded on creation, the words are loaded from
+    the storage on the first access to `words`. Once loaded, the `Word` objects are
+    the only copy of the words, serialized directly from their dicts
+
+    Every change bumps the lexicon generation, saves are skipped unless the
+    generation changed since the last save
+
+    Ids of new words are allocated from the `next-id` counter of the lexicon header,
+    so ids of removed words are never reused and stale references to them can't
+    point to new words. The loaded words are indexed for searches and reference
+    counts by `indexes`
+    """
+
     __gtype_name__ = "Lexicon"
 
-    def __init__(self, path: Path) -> "Lexicon":
+    def __init__(
+        self,
+        storage_: storage.LexiconStorage,
+        header: dict = None,
+        word_count: int = None,
+    ) -> "Lexicon":
         super().__init__()
-        self._file = open(path, "r+", encoding="utf-8")
-        self._path = path
-        self._data = yaml.safe_load(self._file)
+        self._storage = storage_
+        self._data = storage_.load_header() if header is None else header
         self.id = self._data["id"]
-        self.words: list[Word] = []
-
-        self.__populate_words()
+        self._words: list[Word] = None
+        self._words_by_id: dict[int, Word] = {}
+        self._indexes: WordIndexes = None
+        self._word_count = storage_.word_count if word_count is None else word_count
+        # Changes not yet committed to the storage, `None` stands for a removed word
+        self._changes: dict[int, Union[Word, None]] = {}
+        self._generation: int = 0
+        self._saved_generation: int = 0
+        # Whether changes read from the storage are being applied
+        self._reloading: bool = False
 
     def __iter__(self) -> Iterator["Word"]:
         """Iterate over the words in the lexicon"""
@@ -121,10 +433,59 @@ class Lexicon(GObject.Object):
         """Return the number of words in the lexicon"""
         return len(self.words)
 
+    @property
+    def words(self) -> list["Word"]:
+        """Words of the lexicon, loaded on the first access"""
+        if self._words is None:
+            self.__populate_words()
+        return self._words
+
+    @property
+    def loaded(self) -> bool:
+        """Whether the words of the lexicon are loaded"""
+        return self._words is not None
+
+    @property
+    def word_count(self) -> int:
+        """Number of words in the lexicon, without loading them if it's known"""
+        if self._words is None and self._word_count is not None:
+            return self._word_count
+        return len(self.words)
+
+    @property
+    def indexes(self) -> WordIndexes:
+        """Indexes of the words, loaded on the first access"""
+        if self._words is None:
+            self.__populate_words()
+        return self._indexes
+
+    @property
+    def dirty(self) -> bool:
+        """Whether the lexicon has changes which are not saved yet"""
+        return self._generation != self._saved_generation
+
     def __populate_words(self) -> None:
-        """Populate the words list with the words from the lexicon"""
-        for word in self._data["words"]:
-            self.words.append(Word(word, self))
+        """Populate the words list with the words from the lexicon storage"""
+        if "words" in self._data:
+            words = self._data.pop("words")
+        else:
+            data = self._storage.load()
+            words = data.pop("words")
+            # Headers from the lexicons index have only the keys needed for listing
+            for key, value in data.items():
+                self._data.setdefault(key, value)
+            logger.debug("Loaded words of the lexicon “%s”", self.name)
+        self._words = [Word(word, self) for word in words]
+        self._words_by_id = {word.id: word for word in self._words}
+        self._indexes = WordIndexes(self._words_by_id)
+        # Lexicons written before the counter existed or by other programs
+        self.__reserve_ids(max(self._words_by_id, default=0) + 1)
+
+    def __reserve_ids(self, next_id: int) -> None:
+        """Make sure that new words get ids starting from `next_id` at least"""
+        self._data[storage.NEXT_ID_KEY] = max(
+            self._data.get(storage.NEXT_ID_KEY, 1), next_id
+        )
 
     def get_word(self, word_id: int) -> Union["Word", None]:
         """Return the word with the given id from the lexicon
@@ -139,10 +500,86 @@ class Lexicon(GObject.Object):
         Word
             Word object if found, None otherwise
         """
-        for word in self.words:
-            if word.id == word_id:
-                return word
-        return None
+        if self._words is None:
+            self.__populate_words()
+        return self._words_by_id.get(word_id)
+
+    def new_word_id(self) -> int:
+        """Allocate an id for a new word
+
+        Returns
+        -------
+        int
+            ID which was never used in the lexicon
+        """
+        if self._words is None:
+            self.__populate_words()
+        word_id = self._data[storage.NEXT_ID_KEY]
+        self._data[storage.NEXT_ID_KEY] = word_id + 1
+        return word_id
+
+    def reload(
+        self, storage_: storage.LexiconStorage
+    ) -> tuple[list["Word"], list["Word"], list["Word"]]:
+        """Switch to a storage of the lexicon changed by another program
+
+        The words are matched by their ids: changed `Word` objects are updated in
+        place and unchanged ones are kept as they are. Unsaved changes of the lexicon
+        take precedence over the storage, so they're written on the next save
+
+        Parameters
+        ----------
+        storage_ : LexiconStorage
+            New storage of the lexicon
+
+        Returns
+        -------
+        tuple[list[Word], list[Word], list[Word]]
+            Added, changed and removed words, all empty if the words aren't loaded
+        """
+        data = storage_.load()
+        self._storage = storage_
+        words = data.pop("words")
+        renamed = data["name"] != self._data["name"]
+        if self._words is None:
+            self._data = {**data, "words": words}
+            self._word_count = len(words)
+            if renamed:
+                self.notify("name")
+            return [], [], []
+
+        next_id = self._data.get(storage.NEXT_ID_KEY, 1)
+        self._data = data
+        current = {word.id: word for word in self._words}
+        kept, added, changed = [], [], []
+        self._reloading = True
+        try:
+            for word_data in words:
+                word = current.pop(word_data["id"], None)
+                if word_data["id"] in self._changes:
+                    # Kept unless it's removed but not saved yet
+                    if word is not None:
+                        kept.append(word)
+                elif word is None:
+                    kept.append(word := Word(word_data, self))
+                    added.append(word)
+                else:
+                    kept.append(word)
+                    if word.reload(word_data):
+                        changed.append(word)
+        finally:
+            self._reloading = False
+        # Words added and not saved yet are missing in the storage
+        kept.extend(word for word in current.values() if word.id in self._changes)
+        removed = [word for word in current.values() if word.id not in self._changes]
+        self._words = kept
+        self._words_by_id = {word.id: word for word in kept}
+        self._indexes = WordIndexes(self._words_by_id)
+        # Ids allocated but not saved yet stay reserved
+        self.__reserve_ids(max(next_id, max(self._words_by_id, default=0) + 1))
+        if renamed:
+            self.notify("name")
+        return added, changed, removed
 
     def add_word(self, word: dict) -> Self:
         """Adds a new word to the lexicon
@@ -150,11 +587,20 @@ class Lexicon(GObject.Object):
         Parameters
         ----------
         word : dict
-            Dict containing the word data
+            Dict containing the word data, usually with an id from `new_word_id()`
+
+        Raises
+        ------
+        ValueError
+            If the lexicon already has a word with the same id
         """
-        self.words.append(Word(word, self))
-        self._data["words"].append(word)
-        self.save()
+        if self.get_word(word["id"]) is not None:
+            raise ValueError("Word ID already exists")
+        self.words.append(word_ := Word(word, self))
+        self._words_by_id[word_.id] = word_
+        self._indexes.add(word_)
+        self.__reserve_ids(word_.id + 1)
+        self.save(word_)
         return self
 
     def rm_word(self, id_: int) -> Self:
@@ -165,80 +611,132 @@ class Lexicon(GObject.Object):
         id : int
             ID of the word to remove
         """
-        for i, word in enumerate(self.words):
-            if word.id == id_:
-                for _word in self.words:
-                    if word.id in _word.references:
-                        logger.debug(
-                            "Dereffering “%s” from “%s”", word.word, _word.word
-                        )
-                        _word.rm_reference(word.id)
-                # pylint: disable=protected-access
-                self._data["words"].remove(word._word)
-                self.words.pop(i)
-                break
-        else:
+        word = self.get_word(id_)
+        if word is None:
             raise ValueError("Word not found")
+        for referrer_id in self._indexes.referrers(id_):
+            referrer = self._words_by_id[referrer_id]
+            logger.debug("Dereffering “%s” from “%s”", word.word, referrer.word)
+            referrer.rm_reference(id_)
+        self._indexes.remove(word)
+        self.words.remove(word)
+        del self._words_by_id[id_]
+        self._changes[id_] = None
         self.save()
         return self
 
     def _save(self) -> None:
-        """Save the lexicon to the file"""
-        words = []
-        for word in self.words:
-            words.append(word._word)  # pylint: disable=protected-access
-        self._data["words"] = words
-        self._file.seek(0)
-        self._file.truncate(0)
-        yaml.dump(
-            self._data,
-            self._file,
-            sort_keys=False,
-            encoding=None,
-            allow_unicode=True,
-        )
+        """Commit the changes made since the last save to the storage, if any"""
+        if not self.dirty:
+            return
+        generation = self._generation
+        changes = self._changes
+        self._changes = {}
+        try:
+            self._storage.commit(self, changes)
+        except BaseException:
+            # Keep the changes for the next save, newer ones take precedence
+            self._changes = changes | self._changes
+            raise
+        self._saved_generation = generation
+
+    def export_data(self) -> dict:
+        """Return the lexicon data in the format of the YAML Lexicon files
+
+        Words which aren't loaded are read from the storage without loading them into
+        the lexicon, so exports don't keep every lexicon in memory
+
+        Returns
+        -------
+        dict
+            Lexicon header with the words under `words`
+        """
+        if self._words is not None:
+            header = self._data
+            # pylint: disable=protected-access
+            words = serialization.LazySequence(word._word for word in self._words)
+        elif "words" in self._data:
+            header = self._data
+            words = self._data["words"]
+        else:
+            data = self._storage.load()
+            words = data.pop("words")
+            # Headers from the lexicons index have only the keys needed for listing
+            header = {**data, **self._data}
+        return {
+            **{key: value for key, value in header.items() if key != "words"},
+            "words": words,
+        }
+
+    def dump(self) -> str:
+        """Return the lexicon serialized as YAML, see `export_data()`
+
+        Returns
+        -------
+        str
+            The lexicon in the format of the YAML Lexicon files
+        """
+        return serialization.dump(self.export_data())
+
+    def save(self, word: Union["Word", None] = None) -> None:
+        """Schedule saving of the lexicon, unless it should be saved on app exit
 
-    def save(self) -> None:
+        Parameters
+        ----------
+        word : Word, optional
+            Word that was changed
+        """
+        if self._reloading:
+            # The changes are read from the storage, nothing to save
+            return
+        if word is not None:
+            self._changes[word.id] = word
+        self._generation += 1
         if not enums.Schema.SAVE_ON_EXIT():
-            self._save()
+            shared.lexictrl.save_scheduler.schedule(self)
 
     @classmethod
-    def from_str(cls, path: str) -> "Lexicon":
-        """Create a Lexicon object from a string"""
-        return cls(Path(path))
+    def from_str(cls, path: str, snapshot: dict = None) -> "Lexicon":
+        """Create a Lexicon object from a string
+
+        Parameters
+        ----------
+        path : str
+            Path of the lexicon file
+        snapshot : dict, optional
+            Already parsed content of the lexicon file
+        """
+        return cls(storage.FileStorage(Path(path), snapshot))
+
+    @classmethod
+    def from_index(cls, path: str, entry: dict) -> "Lexicon":
+        """Create a Lexicon object from its lexicons index entry, without reading it
+
+        Parameters
+        ----------
+        path : str
+            Path of the lexicon file
+        entry : dict
+            Up to date entry of the lexicon in the lexicons index
+        """
+        return cls(
+            storage.FileStorage(Path(path)),
+            {"id": entry["id"], "name": entry["name"]},
+            entry["words"],
+        )
 
     @classmethod
     def for_unexistent(cls, name: str) -> "Lexicon":
         """Create a Lexicon object for a new lexicon
-        
+
         Also create corresponding file
         """
-        while True:
-            lexicon_id = str(uuid.uuid4().hex)
-            lexicon_path = os.path.join(
-                shared.data_dir, "lexicons", lexicon_id + ".yaml"
-            )
-            if not os.path.exists(lexicon_path):
-                break
-
-        with open(lexicon_path, "w", encoding="utf-8") as file:
-            yaml.dump(
-                {
-                    "id": lexicon_id,
-                    "name": name,
-                    "words": [],
-                },
-                file,
-                sort_keys=False,
-                encoding=None,
-                allow_unicode=True,
-            )
-        return cls(Path(lexicon_path))
+        return cls(storage.create(name))
 
     @property
     def path(self) -> tuple[Path, str]:
         """Get the path of the lexicon as a list of Path and str"""
-        return (self._path, str(self._path))
+        return (self._storage.path, str(self._storage.path))
 
     @GObject.Property(type=str)
     def name(self) -> str:
@@ -249,14 +747,7 @@ class Lexicon(GObject.Object):
     def name(self, name: str) -> None:
         """The name of the lexicon"""
         self._data["name"] = name
-        with open(self._path, "w", encoding="utf-8") as file:
-            yaml.dump(
-                self._data,
-                file,
-                sort_keys=False,
-                encoding=None,
-                allow_unicode=True,
-            )
+        self._storage.set_name(self, name)
 
 
 # pylint: disable=too-many-public-methods
@@ -275,14 +766,49 @@ class Word(GObject.Object):
         super().__init__()
         self._word = word
         self.parent_lexicon = parent_lexicon
+        self._types_mask: int = None
+
+        for signal in (
+            "notify::word",
+            "notify::pronunciation",
+            "tags-changed",
+            "translations-changed",
+            "examples-changed",
+            "references-changed",
+            "types-changed",
+        ):
+            self.connect(signal, lambda *_: self.parent_lexicon.save(self))
+        for signal in ("notify::word", "translations-changed", "examples-changed"):
+            self.connect(
+                signal, lambda *_: self.parent_lexicon.indexes.reindex_text(self)
+            )
 
-        self.connect("notify::word", lambda *_: self.parent_lexicon.save())
-        self.connect("notify::pronunciation", lambda *_: self.parent_lexicon.save())
-        self.connect("tags-changed", lambda *_: self.parent_lexicon.save())
-        self.connect("translations-changed", lambda *_: self.parent_lexicon.save())
-        self.connect("examples-changed", lambda *_: self.parent_lexicon.save())
-        self.connect("references-changed", lambda *_: self.parent_lexicon.save())
-        self.connect("types-changed", lambda *_: self.parent_lexicon.save())
+    def reload(self, word: dict) -> bool:
+        """Replace the data of the word with one read from the storage
+
+        Emits the signals of the changed properties
+
+        Parameters
+        ----------
+        word : dict
+            New data of the word
+
+        Returns
+        -------
+        bool
+            Whether anything changed
+        """
+        old, self._word = self._word, word
+        self._types_mask = None
+        if old == word:
+            return False
+        for prop in ("word", "pronunciation"):
+            if old[prop] != word[prop]:
+                self.notify(prop)
+        for prop in ("translations", "types", "examples", "references", "tags"):
+            if old[prop] != word[prop]:
+                self.emit(f"{prop}-changed")
+        return True
 
     def add_translation(self, translation: str) -> Self:
         """Add a translation to the word"""
@@ -315,6 +841,7 @@ class Word(GObject.Object):
         else:
             raise ValueError("Type already exists")
         self._word["types"].sort()
+        self._types_mask = None
         self.emit("types-changed")
         return self
 
@@ -324,6 +851,7 @@ class Word(GObject.Object):
             self._word["types"].remove(type_)
         else:
             raise ValueError("Type not found")
+        self._types_mask = None
         self.emit("types-changed")
         return self
 
@@ -357,6 +885,7 @@ class Word(GObject.Object):
             self._word["references"].append(reference)
         else:
             raise ValueError("Reference already exists")
+        self.parent_lexicon.indexes.add_referrer(reference, self.id)
         self.emit("references-changed")
         return self
 
@@ -366,6 +895,7 @@ class Word(GObject.Object):
             self._word["references"].remove(reference)
         else:
             raise ValueError("Reference not found")
+        self.parent_lexicon.indexes.rm_referrer(reference, self.id)
         self.emit("references-changed")
         return self
 
@@ -376,6 +906,7 @@ class Word(GObject.Object):
         else:
             raise ValueError("Tag already exists")
         self._word["tags"].sort()
+        self.parent_lexicon.indexes.add_tagged(tag, self.id)
         self.emit("tags-changed")
         return self
 
@@ -385,6 +916,7 @@ class Word(GObject.Object):
             self._word["tags"].remove(tag)
         else:
             raise ValueError("Tag not found")
+        self.parent_lexicon.indexes.rm_tagged(tag, self.id)
         self.emit("tags-changed")
         return self
 
@@ -419,15 +951,30 @@ class Word(GObject.Object):
         """Tags of the word"""
         return self._word["tags"]
 
+    @property
+    def search_texts(self) -> tuple[str, str]:
+        """Normalized word and first translation, searched by the text search"""
+        return (
+            search.normalize(self.word),
+            search.normalize(self.translations[0]) if self.translations else "",
+        )
+
+    @property
+    def fulltext_texts(self) -> tuple[str, ...]:
+        """Word, all translations and all examples, searched by the full-text search"""
+        return (self.word, *self.translations, *self.examples)
+
+    @property
+    def types_mask(self) -> int:
+        """Bitmask of the types of the word, see `types_mask()`"""
+        if self._types_mask is None:
+            self._types_mask = types_mask(self.types)
+        return self._types_mask
+
     @property
     def ref_count(self) -> int:
-        """The amount this word was referenced"""
-        cnt = 0
-        for word_ in self.parent_lexicon:
-            for reference in word_.references:
-                if reference == self.id:
-                    cnt += 1
-        return cnt
+        """The number of words referring to this word"""
+        return self.parent_lexicon.indexes.ref_count(self.id)
 
     # GObject properties
     @GObject.Property(type=str)
@@ -1,19 +1,17 @@
 """Methods for Lexi database Export/Import in various formats"""
 
-import glob
 import os
-import pathlib
 import shutil
 import sqlite3
 import tempfile
 import uuid
 import zipfile
 
-import yaml
 from gi.repository import Adw
 
 from lexi import shared
 from lexi.logging.logger import logger
+from lexi.utils import lexicon_index, serialization
 
 
 def export_database(path: str) -> None:
@@ -32,13 +30,19 @@ def export_database(path: str) -> None:
                 os.path.join(shared.data_dir, "config.yaml"), arcname="config.yaml"
             )
 
-        if os.path.isdir(os.path.join(shared.data_dir, "lexicons")):
-            for filename in glob.glob(
-                os.path.join(shared.data_dir, "lexicons", "*yaml")
-            ):
-                logger.debug("Exporting lexicons/%s", pathlib.Path(filename).name)
-                arcname = os.path.relpath(filename, shared.data_dir)
-                zipf.write(filename, arcname=arcname)
+        # Lexicons are exported from memory, so the archive always contains plain
+        # YAML lexicons, whatever storage backend is used. Their files are
+        # checksummed with the export, so the pending writes land first
+        shared.lexictrl.writer.drain()
+        for lexicon in shared.lexictrl:
+            logger.debug("Exporting lexicons/%s.yaml", lexicon.id)
+            data = lexicon.dump().encode("utf-8")
+            zipf.writestr(f"lexicons/{lexicon.id}.yaml", data)
+            if not lexicon.dirty:
+                # Lets importing the same content again keep the lexicon
+                shared.lexictrl.index.set_export(
+                    lexicon.path[0], lexicon_index.checksum(data)
+                )
 
         if os.path.exists(path):
             toast = Adw.Toast(
@@ -62,15 +66,30 @@ def import_database(zip_path: str) -> None:
     path = shared.data_dir
     with zipfile.ZipFile(zip_path, "r") as zipf:
         if proof_of_content(zip_path):
+            # Lexicons exported with the same content are kept with their files
+            unchanged = shared.lexictrl.unchanged_since_export(_checksums(zipf))
+            logger.info("Keeping %d unchanged lexicons", len(unchanged))
+            kept = {name.partition(".")[0] for name in unchanged} | {"index"}
+            shared.lexictrl.close()
             if os.path.exists(path) and os.path.isdir(path):
                 for item in os.listdir(path):
                     item_path = os.path.join(path, item)
-                    if os.path.isfile(item_path) or os.path.islink(item_path):
+                    if item == "lexicons" and os.path.isdir(item_path):
+                        _clear_lexicons_dir(item_path, kept)
+                    elif os.path.isfile(item_path) or os.path.islink(item_path):
                         os.unlink(item_path)
                     elif os.path.isdir(item_path):
                         shutil.rmtree(item_path)
             if os.path.exists(zip_path) and zipfile.is_zipfile(zip_path):
-                zipf.extractall(path)
+                zipf.extractall(
+                    path,
+                    (
+                        member
+                        for member in zipf.namelist()
+                        if os.path.dirname(member) != "lexicons"
+                        or os.path.basename(member) not in unchanged
+                    ),
+                )
                 toast = Adw.Toast(
                     title=_("Database imported successfully"),
                     timeout=10,
@@ -89,12 +108,11 @@ def import_database(zip_path: str) -> None:
                 shared.win.references_list_box.remove_all()
                 shared.lexictrl.regenerate_lexicons()
                 shared.win.build_sidebar()
-                shared.config_file = open(
-                    os.path.join(shared.data_dir, "config.yaml"),
-                    "r+",
-                    encoding="utf-8",
-                )
-                shared.config = yaml.safe_load(shared.config_file)
+                with open(
+                    os.path.join(shared.data_dir, "config.yaml"), "r", encoding="utf-8"
+                ) as f:
+                    shared.config = serialization.load(f)
+                shared.win.update_types_filter()
 
         else:
             toast = Adw.Toast(
@@ -104,6 +122,37 @@ def import_database(zip_path: str) -> None:
         shared.win.toast_overlay.add_toast(toast)
 
 
+def _checksums(zipf: zipfile.ZipFile) -> dict[str, str]:
+    """Return the checksums of the Lexicon files in a backup by their file names"""
+    checksums = {}
+    for member in zipf.namelist():
+        if member.startswith("lexicons/") and member.endswith(".yaml"):
+            with zipf.open(member) as file:
+                checksums[os.path.basename(member)] = lexicon_index.checksum_file(file)
+    return checksums
+
+
+def _clear_lexicons_dir(directory: str, kept: set[str]) -> None:
+    """Remove the files in the lexicons directory, except the ones in `kept`
+
+    Parameters
+    ----------
+    directory : str
+        Path of the lexicons directory
+    kept : set[str]
+        Names of the kept files without suffixes, so a kept Lexicon keeps its journal
+        and shards too
+    """
+    for item in os.listdir(directory):
+        if item.partition(".")[0] in kept:
+            continue
+        item_path = os.path.join(directory, item)
+        if os.path.isdir(item_path) and not os.path.islink(item_path):
+            shutil.rmtree(item_path)
+        else:
+            os.unlink(item_path)
+
+
 def proof_of_content(zip_path: str) -> bool:
     """
     Verify the contents of the zip archive.
@@ -131,7 +180,7 @@ def proof_of_content(zip_path: str) -> bool:
             tmp_dir = tempfile.mkdtemp()
             zipf.extract("config.yaml", tmp_dir)
             with open(os.path.join(tmp_dir, "config.yaml"), "r", encoding="utf-8") as f:
-                cfg = yaml.safe_load(f)
+                cfg = serialization.load(f)
                 shutil.rmtree(tmp_dir)
                 if cfg["version"] != shared.CACHEV:
                     database_version_mismatch_panic()
@@ -197,37 +246,38 @@ def export_memorado_database(path: str) -> None:
                    icon TEXT)"""
     )
 
-    for lexicon in pathlib.Path(os.path.join(shared.data_dir, "lexicons")).iterdir():
-        with open(str(lexicon), "r") as file:
-            lexicon_data = yaml.safe_load(file)
-            logger.debug("Exporting Lexicon “%s”", lexicon_data["name"])
-            deck_id = str(uuid.uuid4().hex)
+    # Lexicons which aren't loaded are read from their files
+    shared.lexictrl.writer.drain()
+    for lexicon in shared.lexictrl:
+        logger.debug("Exporting Lexicon “%s”", lexicon.name)
+        deck_id = str(uuid.uuid4().hex)
+        cursor.execute(
+            """INSERT INTO decks VALUES (
+                    :deck_id, :name, :icon)""",
+            {
+                "deck_id": deck_id,
+                "name": lexicon.name,
+                "icon": "🤖",
+            },
+        )
+        # Words of the lexicons which aren't loaded are read without loading them
+        for word in lexicon.export_data()["words"]:
+            logger.debug(
+                "Exporting word “%s” from Lexicon “%s”",
+                word["word"],
+                lexicon.name,
+            )
             cursor.execute(
-                """INSERT INTO decks VALUES (
-                        :deck_id, :name, :icon)""",
+                """INSERT INTO cards VALUES (
+                           :deck_id, :front, :back)""",
                 {
                     "deck_id": deck_id,
-                    "name": lexicon_data["name"],
-                    "icon": "🤖",
+                    "front": word["word"],
+                    "back": ", ".join(word["translations"]),
                 },
             )
-            for word in lexicon_data["words"]:
-                logger.debug(
-                    "Exporting word “%s” from Lexicon “%s”",
-                    word["word"],
-                    lexicon_data["name"],
-                )
-                cursor.execute(
-                    """INSERT INTO cards VALUES (
-                               :deck_id, :front, :back)""",
-                    {
-                        "deck_id": deck_id,
-                        "front": word["word"],
-                        "back": ", ".join(word["translations"]),
-                    },
-                )
-            conn.commit()
-            logger.debug("Export of “%s” Lexicon completed", lexicon_data["name"])
+        conn.commit()
+        logger.debug("Export of “%s” Lexicon completed", lexicon.name)
     conn.commit()
     conn.close()
     if os.path.exists(path):
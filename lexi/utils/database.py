@@ -0,0 +1,328 @@
+"""SQLite database keeping all Lexicons in indexed tables"""
+
+import sqlite3
+from contextlib import contextmanager
+from typing import Iterable, Iterator, Union
+
+from lexi import enums
+from lexi.logging.logger import logger
+
+SCHEMA_VERSION = 1
+
+# (table, word dict key) pairs for the list properties of the words
+LIST_TABLES: tuple[tuple[str, str], ...] = (
+    ("translations", "translations"),
+    ("types", "types"),
+    ("examples", "examples"),
+    ("word_references", "references"),
+    ("tags", "tags"),
+)
+
+_LIST_TABLE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS {table} (
+    lexicon_id TEXT NOT NULL,
+    word_id INTEGER NOT NULL,
+    position INTEGER NOT NULL,
+    value NOT NULL,
+    PRIMARY KEY (lexicon_id, word_id, position),
+    FOREIGN KEY (lexicon_id, word_id) REFERENCES words (lexicon_id, id)
+        ON DELETE CASCADE
+) WITHOUT ROWID;
+"""
+
+SCHEMA = (
+    """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value
+);
+CREATE TABLE IF NOT EXISTS lexicons (
+    id TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    next_id INTEGER
+);
+CREATE TABLE IF NOT EXISTS words (
+    lexicon_id TEXT NOT NULL REFERENCES lexicons (id) ON DELETE CASCADE,
+    id INTEGER NOT NULL,
+    word TEXT NOT NULL,
+    pronunciation TEXT NOT NULL DEFAULT '',
+    PRIMARY KEY (lexicon_id, id)
+) WITHOUT ROWID;
+"""
+    + "".join(_LIST_TABLE_SCHEMA.format(table=table) for table, _key in LIST_TABLES)
+    + """
+CREATE INDEX IF NOT EXISTS words_word ON words (lexicon_id, word);
+CREATE INDEX IF NOT EXISTS word_references_value ON word_references (lexicon_id, value);
+CREATE INDEX IF NOT EXISTS tags_value ON tags (lexicon_id, value);
+CREATE INDEX IF NOT EXISTS types_value ON types (lexicon_id, value);
+"""
+)
+
+_SYNCHRONOUS: dict[enums.FsyncPolicy, str] = {
+    enums.FsyncPolicy.ALWAYS: "FULL",
+    enums.FsyncPolicy.BATCHED: "NORMAL",
+    enums.FsyncPolicy.NEVER: "OFF",
+}
+
+
+class Database:
+    """SQLite database with Lexicons, their words and the words' list properties
+
+    Every mutating method runs in a transaction, nested transactions are merged into
+    the outermost one
+
+    Parameters
+    ----------
+    path : str
+        Path of the database file, created if it doesn't exist
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._conn = sqlite3.connect(path, isolation_level=None)
+        self._depth = 0
+        self._conn.execute("PRAGMA foreign_keys = ON")
+        self._conn.execute("PRAGMA journal_mode = WAL")
+        self._conn.execute(
+            f"PRAGMA synchronous = {_SYNCHRONOUS[enums.Schema.FSYNC_POLICY()]}"
+        )
+        self._conn.executescript(SCHEMA)
+        self.set_meta("schema-version", SCHEMA_VERSION)
+        logger.debug("Opened database “%s”", path)
+
+    @contextmanager
+    def transaction(self) -> Iterator[None]:
+        """Run the statements executed in this context in a single transaction"""
+        if self._depth == 0:
+            self._conn.execute("BEGIN IMMEDIATE")
+        self._depth += 1
+        try:
+            yield
+        except BaseException:
+            self._depth -= 1
+            if self._depth == 0:
+                self._conn.execute("ROLLBACK")
+            raise
+        self._depth -= 1
+        if self._depth == 0:
+            self._conn.execute("COMMIT")
+
+    def close(self) -> None:
+        """Close the database connection"""
+        self._conn.close()
+        logger.debug("Closed database “%s”", self.path)
+
+    def get_meta(self, key: str) -> Union[str, int, None]:
+        """Return a value from the database metadata
+
+        Parameters
+        ----------
+        key : str
+            Key of the value
+
+        Returns
+        -------
+        str | int | None
+            The value if set, None otherwise
+        """
+        row = self._conn.execute("SELECT value FROM meta WHERE key = ?", (key,))
+        row = row.fetchone()
+        return row[0] if row else None
+
+    def set_meta(self, key: str, value: Union[str, int]) -> None:
+        """Set a value in the database metadata
+
+        Parameters
+        ----------
+        key : str
+            Key of the value
+        value : str | int
+            The value
+        """
+        with self.transaction():
+            self._conn.execute(
+                "INSERT INTO meta VALUES (?, ?) "
+                "ON CONFLICT (key) DO UPDATE SET value = excluded.value",
+                (key, value),
+            )
+
+    def lexicons(self) -> list[dict]:
+        """Return headers of all Lexicons in the database
+
+        Returns
+        -------
+        list[dict]
+            Headers of every Lexicon, see `get_lexicon()`
+        """
+        return [
+            _header(row)
+            for row in self._conn.execute("SELECT id, name, next_id FROM lexicons")
+        ]
+
+    def get_lexicon(self, lexicon_id: str) -> Union[dict, None]:
+        """Return the header of a Lexicon
+
+        Parameters
+        ----------
+        lexicon_id : str
+            ID of the Lexicon
+
+        Returns
+        -------
+        dict | None
+            Dict with `id`, `name` and, if it's known, `next-id` of the Lexicon if
+            found, None otherwise
+        """
+        row = self._conn.execute(
+            "SELECT id, name, next_id FROM lexicons WHERE id = ?", (lexicon_id,)
+        ).fetchone()
+        return _header(row) if row else None
+
+    def add_lexicon(self, lexicon_id: str, name: str) -> None:
+        """Add an empty Lexicon
+
+        Parameters
+        ----------
+        lexicon_id : str
+            ID of the Lexicon
+        name : str
+            Name of the Lexicon
+        """
+        with self.transaction():
+            self._conn.execute(
+                "INSERT INTO lexicons (id, name) VALUES (?, ?)", (lexicon_id, name)
+            )
+
+    def rename_lexicon(self, lexicon_id: str, name: str) -> None:
+        """Set the name of a Lexicon
+
+        Parameters
+        ----------
+        lexicon_id : str
+            ID of the Lexicon
+        name : str
+            New name of the Lexicon
+        """
+        with self.transaction():
+            self._conn.execute(
+                "UPDATE lexicons SET name = ? WHERE id = ?", (name, lexicon_id)
+            )
+
+    def set_next_id(self, lexicon_id: str, next_id: int) -> None:
+        """Set the id for the next new word of a Lexicon
+
+        Parameters
+        ----------
+        lexicon_id : str
+            ID of the Lexicon
+        next_id : int
+            ID for the next new word
+        """
+        with self.transaction():
+            self._conn.execute(
+                "UPDATE lexicons SET next_id = ? WHERE id = ?", (next_id, lexicon_id)
+            )
+
+    def rm_lexicon(self, lexicon_id: str) -> None:
+        """Remove a Lexicon with all its words
+
+        Parameters
+        ----------
+        lexicon_id : str
+            ID of the Lexicon
+        """
+        with self.transaction():
+            self._conn.execute("DELETE FROM lexicons WHERE id = ?", (lexicon_id,))
+
+    def load_words(self, lexicon_id: str) -> list[dict]:
+        """Return all words of a Lexicon
+
+        Parameters
+        ----------
+        lexicon_id : str
+            ID of the Lexicon
+
+        Returns
+        -------
+        list[dict]
+            Words in the same format as they are stored in the YAML Lexicon files
+        """
+        words: dict[int, dict] = {}
+        for id_, word, pronunciation in self._conn.execute(
+            "SELECT id, word, pronunciation FROM words "
+            "WHERE lexicon_id = ? ORDER BY id",
+            (lexicon_id,),
+        ):
+            words[id_] = {
+                "id": id_,
+                "word": word,
+                "translations": [],
+                "pronunciation": pronunciation,
+                "types": [],
+                "examples": [],
+                "references": [],
+                "tags": [],
+            }
+        for table, key in LIST_TABLES:
+            for word_id, value in self._conn.execute(
+                f"SELECT word_id, value FROM {table} WHERE lexicon_id = ? "
+                "ORDER BY word_id, position",
+                (lexicon_id,),
+            ):
+                words[word_id][key].append(value)
+        return list(words.values())
+
+    def put_words(self, lexicon_id: str, words: Iterable[dict]) -> None:
+        """Add words to a Lexicon or replace the existing words with the same ids
+
+        Parameters
+        ----------
+        lexicon_id : str
+            ID of the Lexicon
+        words : Iterable[dict]
+            Words in the same format as they are stored in the YAML Lexicon files
+        """
+        with self.transaction():
+            for word in words:
+                self._conn.execute(
+                    "INSERT INTO words VALUES (?, ?, ?, ?) "
+                    "ON CONFLICT (lexicon_id, id) DO UPDATE SET "
+                    "word = excluded.word, pronunciation = excluded.pronunciation",
+                    (lexicon_id, word["id"], word["word"], word["pronunciation"]),
+                )
+                for table, key in LIST_TABLES:
+                    self._conn.execute(
+                        f"DELETE FROM {table} WHERE lexicon_id = ? AND word_id = ?",
+                        (lexicon_id, word["id"]),
+                    )
+                    self._conn.executemany(
+                        f"INSERT INTO {table} VALUES (?, ?, ?, ?)",
+                        (
+                            (lexicon_id, word["id"], position, value)
+                            for position, value in enumerate(word[key])
+                        ),
+                    )
+
+    def rm_words(self, lexicon_id: str, word_ids: Iterable[int]) -> None:
+        """Remove words from a Lexicon
+
+        Parameters
+        ----------
+        lexicon_id : str
+            ID of the Lexicon
+        word_ids : Iterable[int]
+            IDs of the words to remove
+        """
+        with self.transaction():
+            self._conn.executemany(
+                "DELETE FROM words WHERE lexicon_id = ? AND id = ?",
+                ((lexicon_id, word_id) for word_id in word_ids),
+            )
+
+
+def _header(row: tuple) -> dict:
+    id_, name, next_id = row
+    header = {"id": id_, "name": name}
+    if next_id is not None:
+        header["next-id"] = next_id
+    return header
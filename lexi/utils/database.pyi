@@ -0,0 +1,24 @@
+# pylint: disable=all
+from typing import ContextManager, Iterable, Union
+
+SCHEMA_VERSION: int
+LIST_TABLES: tuple[tuple[str, str], ...]
+SCHEMA: str
+
+class Database:
+    path: str
+
+    def __init__(self, path: str) -> None: ...
+    def transaction(self) -> ContextManager[None]: ...
+    def close(self) -> None: ...
+    def get_meta(self, key: str) -> Union[str, int, None]: ...
+    def set_meta(self, key: str, value: Union[str, int]) -> None: ...
+    def lexicons(self) -> list[dict]: ...
+    def get_lexicon(self, lexicon_id: str) -> Union[dict, None]: ...
+    def add_lexicon(self, lexicon_id: str, name: str) -> None: ...
+    def rename_lexicon(self, lexicon_id: str, name: str) -> None: ...
+    def set_next_id(self, lexicon_id: str, next_id: int) -> None: ...
+    def rm_lexicon(self, lexicon_id: str) -> None: ...
+    def load_words(self, lexicon_id: str) -> list[dict]: ...
+    def put_words(self, lexicon_id: str, words: Iterable[dict]) -> None: ...
+    def rm_words(self, lexicon_id: str, word_ids: Iterable[int]) -> None: ...
@@ -0,0 +1,267 @@
+"""Durable write-then-rename persistence for Lexi data files"""
+
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Iterator, NamedTuple, Union
+
+from lexi import enums
+from lexi.logging.logger import logger
+
+TMP_SUFFIX = ".tmp"
+
+_local = threading.local()
+
+
+class WriteStats(NamedTuple):
+    """Statistics of a single durable write
+
+    ::
+
+        path : str -> path of the written file
+        bytes_written : int -> amount of bytes written
+        latency : float -> time spent writing, in seconds
+    """
+
+    path: str
+    bytes_written: int
+    latency: float
+
+
+def write(path: Union[str, os.PathLike], data: Union[str, bytes]) -> WriteStats:
+    """Atomically replace the file at `path` with `data`
+
+    The data is written to a temporary file in the same directory, synced to the
+    disk according to the `fsync-policy` setting and then renamed over the original,
+    so the file is either fully old or fully new, even after a crash
+
+    Parameters
+    ----------
+    path : str | os.PathLike
+        Path of the file to write
+    data : str | bytes
+        Content of the file, `str` is encoded as UTF-8
+
+    Returns
+    -------
+    WriteStats
+        Bytes written and time spent on this write
+    """
+    start = time.perf_counter()
+    path = os.fspath(path)
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    policy = _policy()
+    pending = getattr(_local, "batch", None)
+
+    if pending is not None and policy == enums.FsyncPolicy.BATCHED:
+        pending.append((_write_tmp(path, data, fsync=False), path))
+    else:
+        # Outside of a batch the `batched` policy is a batch of a single file
+        sync = policy != enums.FsyncPolicy.NEVER
+        tmp_path = _write_tmp(path, data, fsync=sync)
+        try:
+            os.replace(tmp_path, path)
+        except OSError:
+            _unlink(tmp_path)
+            raise
+        if sync:
+            _fsync_dir(os.path.dirname(path))
+
+    stats = WriteStats(path, len(data), time.perf_counter() - start)
+    logger.debug(
+        "Wrote %d bytes to “%s” in %.2f ms",
+        stats.bytes_written,
+        path,
+        stats.latency * 1000,
+    )
+    return stats
+
+
+def append(path: Union[str, os.PathLike], data: Union[str, bytes]) -> WriteStats:
+    """Append `data` to the end of the file at `path`, creating it if needed
+
+    The file is synced to the disk according to the `fsync-policy` setting
+
+    Parameters
+    ----------
+    path : str | os.PathLike
+        Path of the file to append to
+    data : str | bytes
+        Data to append, `str` is encoded as UTF-8
+
+    Returns
+    -------
+    WriteStats
+        Bytes written and time spent on this write
+    """
+    start = time.perf_counter()
+    path = os.fspath(path)
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    policy = _policy()
+    pending = getattr(_local, "batch", None)
+
+    created = not os.path.exists(path)
+    with open(path, "ab") as file:
+        file.write(data)
+        file.flush()
+        if pending is not None and policy == enums.FsyncPolicy.BATCHED:
+            _local.appended.add(path)
+        elif policy != enums.FsyncPolicy.NEVER:
+            os.fsync(file.fileno())
+            if created:
+                _fsync_dir(os.path.dirname(path))
+
+    stats = WriteStats(path, len(data), time.perf_counter() - start)
+    logger.debug(
+        "Appended %d bytes to “%s” in %.2f ms",
+        stats.bytes_written,
+        path,
+        stats.latency * 1000,
+    )
+    return stats
+
+
+def after_commit(callback: Callable[[], None]) -> None:
+    """Call `callback` once the writes made so far are committed to their files
+
+    Inside a batch with the `batched` fsync policy the call is deferred until the
+    batch commits and dropped if the batch fails, otherwise `callback` is called
+    immediately
+
+    Parameters
+    ----------
+    callback : Callable[[], None]
+        Function to call
+    """
+    if (
+        getattr(_local, "batch", None) is not None
+        and _policy() == enums.FsyncPolicy.BATCHED
+    ):
+        _local.callbacks.append(callback)
+    else:
+        callback()
+
+
+@contextmanager
+def batch(policy: Union[enums.FsyncPolicy, None] = None) -> Iterator[None]:
+    """Group writes made in this context into a single commit
+
+    With the `batched` fsync policy, temporary files are synced and renamed over
+    their originals and appended files are synced only when the context exits, and
+    each touched directory is synced once. With other policies writes are committed
+    immediately
+
+    Parameters
+    ----------
+    policy : FsyncPolicy, optional
+        Policy to use in this context instead of the `fsync-policy` setting, for
+        threads which shouldn't read the settings
+    """
+    if getattr(_local, "batch", None) is not None:
+        # Nested batches are merged into the outermost one
+        yield
+        return
+
+    _local.policy = policy
+    _local.batch = pending = []
+    _local.appended = appended = set()
+    _local.callbacks = callbacks = []
+    try:
+        yield
+    except BaseException:
+        for tmp_path, _path in pending:
+            _unlink(tmp_path)
+        raise
+    finally:
+        _local.policy = None
+        _local.batch = None
+        _local.appended = None
+        _local.callbacks = None
+    if pending or appended:
+        start = time.perf_counter()
+        _commit(pending, appended)
+        logger.debug(
+            "Committed a batch of %d files in %.2f ms",
+            len(pending) + len(appended),
+            (time.perf_counter() - start) * 1000,
+        )
+    for callback in callbacks:
+        callback()
+
+
+def cleanup(directory: Union[str, os.PathLike]) -> None:
+    """Remove temporary files left in `directory` by interrupted writes
+
+    Parameters
+    ----------
+    directory : str | os.PathLike
+        Directory to clean up
+    """
+    for file in os.listdir(directory):
+        if file.startswith(".") and file.endswith(TMP_SUFFIX):
+            logger.info("Removing leftover temporary file “%s”", file)
+            _unlink(os.path.join(directory, file))
+
+
+def _policy() -> enums.FsyncPolicy:
+    return getattr(_local, "policy", None) or enums.Schema.FSYNC_POLICY()
+
+
+def _write_tmp(path: str, data: bytes, fsync: bool) -> str:
+    directory, name = os.path.split(path)
+    fd, tmp_path = tempfile.mkstemp(
+        prefix=f".{name}.", suffix=TMP_SUFFIX, dir=directory or None
+    )
+    try:
+        try:
+            os.fchmod(fd, os.stat(path).st_mode & 0o777)
+        except FileNotFoundError:
+            os.fchmod(fd, 0o644)
+        with os.fdopen(fd, "wb") as file:
+            file.write(data)
+            file.flush()
+            if fsync:
+                os.fsync(file.fileno())
+    except BaseException:
+        _unlink(tmp_path)
+        raise
+    return tmp_path
+
+
+def _commit(pending: list[tuple[str, str]], appended: set[str]) -> None:
+    for path in [tmp_path for tmp_path, _path in pending] + list(appended):
+        with open(path, "rb") as file:
+            os.fsync(file.fileno())
+    for index, (tmp_path, path) in enumerate(pending):
+        try:
+            os.replace(tmp_path, path)
+        except OSError:
+            for _tmp_path, _path in pending[index:]:
+                _unlink(_tmp_path)
+            raise
+    for directory in {os.path.dirname(path) for _tmp_path, path in pending} | {
+        os.path.dirname(path) for path in appended
+    }:
+        _fsync_dir(directory)
+
+
+def _fsync_dir(directory: str) -> None:
+    try:
+        fd = os.open(directory or ".", os.O_RDONLY | os.O_DIRECTORY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _unlink(path: str) -> None:
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
@@ -0,0 +1,18 @@
+# pylint: disable=all
+import os
+from typing import Callable, ContextManager, NamedTuple, Union
+
+from lexi.enums import FsyncPolicy
+
+TMP_SUFFIX: str
+
+class WriteStats(NamedTuple):
+    path: str
+    bytes_written: int
+    latency: float
+
+def write(path: Union[str, os.PathLike], data: Union[str, bytes]) -> WriteStats: ...
+def append(path: Union[str, os.PathLike], data: Union[str, bytes]) -> WriteStats: ...
+def after_commit(callback: Callable[[], None]) -> None: ...
+def batch(policy: Union[FsyncPolicy, None] = None) -> ContextManager[None]: ...
+def cleanup(directory: Union[str, os.PathLike]) -> None: ...
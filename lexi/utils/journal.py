@@ -0,0 +1,231 @@
+"""Append-only change journal, stored next to the Lexicon YAML snapshot"""
+
+import json
+import os
+from pathlib import Path
+from typing import Any, Union
+
+from lexi.logging.logger import logger
+from lexi.utils import durable
+
+# Fold the journal into the snapshot once it passes any of these thresholds
+COMPACT_RECORDS = 1000
+COMPACT_SIZE = 1024 * 1024
+
+
+class Journal:
+    """Append-only log of changes made to a Lexicon since its last snapshot
+
+    Every line of the journal file is a JSON record of one of the following forms:
+
+    ::
+
+        {"op": "put", "word": {...}} -> add a word or replace the word with the same id
+        {"op": "rm", "id": 1} -> remove the word with the given id
+        {"op": "set", "key": "name", "value": "..."} -> set a Lexicon header value
+
+    Records are idempotent, so replaying a journal over a snapshot that already
+    contains some of its changes is safe
+
+    While a snapshot is written in the background, the records it contains are
+    moved to the rotated journal, which is replayed before the journal itself and
+    removed once the snapshot is written
+
+    Parameters
+    ----------
+    path : Path
+        Path of the journal file
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.rotated_path = path.with_suffix(".rotated" + path.suffix)
+        self.records: int = 0
+        self.size: int = 0
+        # Ids of the words put or removed by the replayed records
+        self.changed_ids: set[int] = set()
+
+    def replay(self, data: dict) -> int:
+        """Apply the journal records to the Lexicon data loaded from the snapshot
+
+        A torn record at the end of the journal, left by an interrupted append, is
+        discarded
+
+        Parameters
+        ----------
+        data : dict
+            Lexicon data as stored in the snapshot, modified in place
+
+        Returns
+        -------
+        int
+            Number of applied records
+        """
+        self.records = 0
+        self.size = 0
+        self.changed_ids = set()
+        paths = [path for path in (self.rotated_path, self.path) if path.exists()]
+        if not paths:
+            return 0
+
+        words = {word["id"]: word for word in data["words"]}
+        for path in paths:
+            records, valid_size = self.__replay_file(path, data, words)
+            self.records += records
+            self.size += valid_size
+            logger.debug("Replayed %d records from “%s”", records, path)
+        data["words"] = list(words.values())
+        return self.records
+
+    def __replay_file(
+        self, path: Path, data: dict, words: dict[int, dict]
+    ) -> tuple[int, int]:
+        """Apply the records of a journal file, return their number and size"""
+        with open(path, "rb") as file:
+            lines = file.readlines()
+
+        records = 0
+        valid_size = 0
+        for index, line in enumerate(lines):
+            try:
+                record = json.loads(line)
+                apply(data, words, record)
+            except (ValueError, KeyError, TypeError):
+                if index == len(lines) - 1:
+                    logger.warning("Discarding torn record at the end of “%s”", path)
+                    os.truncate(path, valid_size)
+                    break
+                logger.warning("Skipping malformed record %d in “%s”", index, path)
+            else:
+                records += 1
+                if record["op"] == "put":
+                    self.changed_ids.add(record["word"]["id"])
+                elif record["op"] == "rm":
+                    self.changed_ids.add(record["id"])
+            valid_size += len(line)
+        return records, valid_size
+
+    def replay_header(self, header: dict) -> None:
+        """Apply only the header records of the journal to the Lexicon header
+
+        Parameters
+        ----------
+        header : dict
+            Lexicon header as stored in the snapshot, modified in place
+        """
+        for path in (self.rotated_path, self.path):
+            if not path.exists():
+                continue
+            with open(path, "rb") as file:
+                for line in file:
+                    # Records are written without spaces, skip parsing of word records
+                    if b'"op":"set"' not in line:
+                        continue
+                    try:
+                        apply(header, {}, json.loads(line))
+                    except (ValueError, KeyError, TypeError):
+                        continue
+
+    def rotate(self) -> Union[Path, None]:
+        """Move all records to the rotated journal, new records start a new journal
+
+        Records of a rotated journal left by an interrupted snapshot write are kept,
+        the records are appended to them
+
+        Returns
+        -------
+        Path | None
+            Path of the rotated journal, None if there are no records
+        """
+        if not self.path.exists():
+            return self.rotated_path if self.rotated_path.exists() else None
+
+        if self.rotated_path.exists():
+            with open(self.path, "rb") as file:
+                durable.append(self.rotated_path, file.read())
+            os.remove(self.path)
+        else:
+            os.replace(self.path, self.rotated_path)
+        self.records = 0
+        self.size = 0
+        return self.rotated_path
+
+    def append(self, records: list[dict]) -> None:
+        """Append records to the journal
+
+        Parameters
+        ----------
+        records : list[dict]
+            Records to append
+        """
+        if not records:
+            return
+        data = "".join(
+            json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n"
+            for record in records
+        )
+        self.size += durable.append(self.path, data).bytes_written
+        self.records += len(records)
+
+    def remove(self) -> None:
+        """Remove the journal files after their changes got into the snapshot"""
+        for path in (self.rotated_path, self.path):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+        self.records = 0
+        self.size = 0
+
+    @property
+    def needs_compaction(self) -> bool:
+        """Whether the journal grew enough to be folded into the snapshot"""
+        return self.records >= COMPACT_RECORDS or self.size >= COMPACT_SIZE
+
+
+def put_record(word: dict) -> dict:
+    """Create a record adding or replacing a word"""
+    return {"op": "put", "word": word}
+
+
+def rm_record(word_id: int) -> dict:
+    """Create a record removing a word"""
+    return {"op": "rm", "id": word_id}
+
+
+def set_record(key: str, value: Any) -> dict:
+    """Create a record setting a Lexicon header value"""
+    return {"op": "set", "key": key, "value": value}
+
+
+def apply(data: dict, words: dict[int, dict], record: dict) -> None:
+    """Apply a single journal record
+
+    Parameters
+    ----------
+    data : dict
+        Lexicon header data
+    words : dict[int, dict]
+        Lexicon words by their ids
+    record : dict
+        Record to apply
+
+    Raises
+    ------
+    ValueError
+        If the record operation is unknown
+    """
+    match record["op"]:
+        case "put":
+            words[record["word"]["id"]] = record["word"]
+        case "rm":
+            words.pop(record["id"], None)
+        case "set":
+            data[record["key"]] = record["value"]
+        case _:
+            raise ValueError(f"Unknown journal operation: {record['op']}")
+
+
+def journal_path(lexicon_path: Union[str, os.PathLike]) -> Path:
+    """Return the journal path for the Lexicon snapshot at `lexicon_path`"""
+    return Path(lexicon_path).with_suffix(".journal")
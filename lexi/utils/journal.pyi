@@ -0,0 +1,29 @@
+# pylint: disable=all
+import os
+from pathlib import Path
+from typing import Any, Union
+
+COMPACT_RECORDS: int
+COMPACT_SIZE: int
+
+class Journal:
+    path: Path
+    rotated_path: Path
+    records: int
+    size: int
+    changed_ids: set[int]
+
+    def __init__(self, path: Path) -> None: ...
+    def replay(self, data: dict) -> int: ...
+    def replay_header(self, header: dict) -> None: ...
+    def rotate(self) -> Union[Path, None]: ...
+    def append(self, records: list[dict]) -> None: ...
+    def remove(self) -> None: ...
+    @property
+    def needs_compaction(self) -> bool: ...
+
+def put_record(word: dict) -> dict: ...
+def rm_record(word_id: int) -> dict: ...
+def set_record(key: str, value: Any) -> dict: ...
+def apply(data: dict, words: dict[int, dict], record: dict) -> None: ...
+def journal_path(lexicon_path: Union[str, os.PathLike]) -> Path: ...
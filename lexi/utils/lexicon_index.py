@@ -0,0 +1,299 @@
+"""Index of the Lexicon files with their headers, so listing Lexicons reads no files
+
+The index is a JSON file keyed by the Lexicon file names:
+
+::
+
+    {"format": 1, "lexicons": {"<id>.yaml": {
+        "id": "...", "name": "...", "words": 0,
+        "mtime": 0, "size": 0, "checksum": "...", "stamp": "...",
+        "export": "...", "files": "..."
+    }}}
+
+An entry is used only while it matches the Lexicon file: `size` must be the current
+size of the file and `mtime` its modification time. A file with only a different
+modification time is checked by its `checksum`. The words are in the journal and
+the shard files, so `stamp` must match the names, sizes and modification times of
+those. Missing and stale entries are rebuilt from the Lexicon files.
+The optional `export` is the checksum of the Lexicon as exported to a backup and
+`files` the checksum of all its files at that time, including the journal and the
+shards. Both are dropped on any change of the Lexicon
+"""
+
+import hashlib
+import json
+import os
+from functools import partial
+from pathlib import Path
+from typing import BinaryIO, Iterable, Union
+
+from gi.repository import GLib
+
+from lexi.logging.logger import logger
+from lexi.utils import durable, journal, shards
+from lexi.utils.writer import Writer
+
+# Bump on any change of the index layout
+INDEX_FORMAT = 2
+
+
+class LexiconIndex:
+    """Headers and word counts of the Lexicon files
+
+    Changes are written once the main loop is idle, by the background writer
+
+    Parameters
+    ----------
+    path : Path
+        Path of the index file
+    writer : Writer
+        Writer to write the index with
+    """
+
+    def __init__(self, path: Path, writer: Writer) -> None:
+        self.path = path
+        self._writer = writer
+        self._entries: dict[str, dict] = {}
+        self._save_source_id: int = None
+
+    def load(self) -> None:
+        """Read the index file, starting with an empty index if it's unusable"""
+        try:
+            with open(self.path, "r", encoding="utf-8") as file:
+                data = json.load(file)
+            if data["format"] != INDEX_FORMAT:
+                raise ValueError(f"Unknown index format {data['format']}")
+            self._entries = data["lexicons"]
+        except FileNotFoundError:
+            logger.info("Lexicons index is missing, rebuilding")
+            self._entries = {}
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.warning("Failed to read the lexicons index, rebuilding: %s", e)
+            self._entries = {}
+
+    def lookup(self, path: Union[str, os.PathLike]) -> Union[dict, None]:
+        """Return the entry of the Lexicon file at `path` if it's up to date
+
+        Parameters
+        ----------
+        path : str | os.PathLike
+            Path of the Lexicon file
+
+        Returns
+        -------
+        dict | None
+            Entry of the Lexicon, None if it's missing or stale
+        """
+        entry = self._entries.get(Path(path).name)
+        if entry is None:
+            return None
+        stat = os.stat(path)
+        if (
+            entry["size"] != stat.st_size
+            or entry["stamp"] != _stamp(path)
+            or (
+                entry["mtime"] != stat.st_mtime_ns
+                and entry["checksum"] != _checksum(path)[0]
+            )
+        ):
+            logger.debug("Index entry of “%s” is stale", path)
+            return None
+        if entry["mtime"] != stat.st_mtime_ns:
+            entry["mtime"] = stat.st_mtime_ns
+            self.__schedule_save()
+        return entry
+
+    def update(
+        self, path: Union[str, os.PathLike], lexicon_id: str, name: str, words: int
+    ) -> None:
+        """Record the current state of the Lexicon file at `path`
+
+        Must be called after every change of the Lexicon file, its journal or its
+        shards
+
+        Parameters
+        ----------
+        path : str | os.PathLike
+            Path of the Lexicon file
+        lexicon_id : str
+            ID of the Lexicon
+        name : str
+            Name of the Lexicon
+        words : int
+            Number of words in the Lexicon
+        """
+        key = Path(path).name
+        entry = self._entries.get(key)
+        stat = os.stat(path)
+        if (
+            entry is not None
+            and entry["size"] == stat.st_size
+            and entry["mtime"] == stat.st_mtime_ns
+        ):
+            digest = entry["checksum"]
+        else:
+            digest, stat = _checksum(path)
+        self._entries[key] = {
+            "id": lexicon_id,
+            "name": name,
+            "words": words,
+            "mtime": stat.st_mtime_ns,
+            "size": stat.st_size,
+            "checksum": digest,
+            "stamp": _stamp(path),
+        }
+        self.__schedule_save()
+
+    def set_export(self, path: Union[str, os.PathLike], checksum_: str) -> None:
+        """Record the checksum of the Lexicon at `path` as exported to a backup
+
+        The files of the Lexicon are checksummed too, so a later change of any of
+        them is noticed by `is_exported()`
+
+        Parameters
+        ----------
+        path : str | os.PathLike
+            Path of the Lexicon file
+        checksum_ : str
+            Checksum of the exported Lexicon file, see `checksum()`
+        """
+        entry = self._entries.get(Path(path).name)
+        if entry is None:
+            return
+        files = _files_checksum(path)
+        if entry.get("export") != checksum_ or entry.get("files") != files:
+            entry["export"] = checksum_
+            entry["files"] = files
+            self.__schedule_save()
+
+    def is_exported(self, path: Union[str, os.PathLike], checksum_: str) -> bool:
+        """Return whether the Lexicon at `path` is unchanged since its export
+
+        Parameters
+        ----------
+        path : str | os.PathLike
+            Path of the Lexicon file
+        checksum_ : str
+            Checksum of the exported Lexicon file, see `checksum()`
+
+        Returns
+        -------
+        bool
+            Whether the Lexicon was exported with `checksum_` and none of its files
+            changed since
+        """
+        entry = self.lookup(path)
+        if entry is None or entry.get("export") != checksum_:
+            return False
+        if entry.get("files") != _files_checksum(path):
+            logger.debug("Files of “%s” changed since the export", path)
+            return False
+        return True
+
+    def remove(self, path: Union[str, os.PathLike]) -> None:
+        """Remove the entry of the Lexicon file at `path`
+
+        Parameters
+        ----------
+        path : str | os.PathLike
+            Path of the removed Lexicon file
+        """
+        if self._entries.pop(Path(path).name, None) is not None:
+            self.__schedule_save()
+
+    def prune(self, paths: Iterable[Union[str, os.PathLike]]) -> None:
+        """Remove the entries of all Lexicon files except `paths`
+
+        Parameters
+        ----------
+        paths : Iterable[str | os.PathLike]
+            Paths of the existing Lexicon files
+        """
+        kept = {Path(path).name for path in paths}
+        for key in [key for key in self._entries if key not in kept]:
+            logger.debug("Dropping index entry of missing “%s”", key)
+            del self._entries[key]
+            self.__schedule_save()
+
+    def flush(self) -> None:
+        """Submit the pending changes of the index to the writer immediately"""
+        if self._save_source_id is not None:
+            GLib.source_remove(self._save_source_id)
+            self.__on_save_idle()
+
+    def __schedule_save(self) -> None:
+        if self._save_source_id is None:
+            self._save_source_id = GLib.idle_add(
+                self.__on_save_idle, priority=GLib.PRIORITY_LOW
+            )
+
+    def __on_save_idle(self) -> bool:
+        self._save_source_id = None
+        data = json.dumps(
+            {"format": INDEX_FORMAT, "lexicons": self._entries},
+            ensure_ascii=False,
+            separators=(",", ":"),
+        )
+        self._writer.submit(str(self.path), partial(durable.write, self.path, data))
+        return GLib.SOURCE_REMOVE
+
+
+def _stamp(path: Union[str, os.PathLike]) -> str:
+    # The journals and shards are only stat'ed, reading them would defeat the index
+    journal_ = journal.Journal(journal.journal_path(path))
+    files = [journal_.rotated_path, journal_.path]
+    try:
+        with os.scandir(shards.shards_dir(path)) as entries:
+            files.extend(
+                sorted(
+                    Path(entry.path)
+                    for entry in entries
+                    if entry.name.endswith(".yaml") and not entry.name.startswith(".")
+                )
+            )
+    except FileNotFoundError:
+        pass
+    digest = hashlib.blake2b()
+    for file in files:
+        try:
+            stat = file.stat()
+        except FileNotFoundError:
+            continue
+        digest.update(f"{file.name}:{stat.st_size}:{stat.st_mtime_ns}\n".encode())
+    return digest.hexdigest()
+
+
+def checksum(data: bytes) -> str:
+    """Return the checksum of the content of a Lexicon file"""
+    return hashlib.blake2b(data).hexdigest()
+
+
+def checksum_file(file: BinaryIO) -> str:
+    """Return the checksum of the content of a binary file, reading it in chunks"""
+    return hashlib.file_digest(file, "blake2b").hexdigest()
+
+
+def _files_checksum(path: Union[str, os.PathLike]) -> str:
+    # Missing files are skipped, so a removed journal changes the checksum too
+    journal_ = journal.Journal(journal.journal_path(path))
+    files = [
+        Path(path),
+        journal_.rotated_path,
+        journal_.path,
+        *sorted(shards.shards_dir(path).glob("*.yaml")),
+    ]
+    digest = hashlib.blake2b()
+    for file in files:
+        try:
+            with open(file, "rb") as opened:
+                digest.update(f"{file.name}:{checksum_file(opened)}\n".encode())
+        except FileNotFoundError:
+            continue
+    return digest.hexdigest()
+
+
+def _checksum(path: Union[str, os.PathLike]) -> tuple[str, os.stat_result]:
+    # The status is taken from the same open file, so it matches the checksum
+    with open(path, "rb") as file:
+        stat = os.fstat(file.fileno())
+        return checksum_file(file), stat
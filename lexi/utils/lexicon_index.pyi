@@ -0,0 +1,26 @@
+# pylint: disable=all
+import os
+from pathlib import Path
+from typing import BinaryIO, Iterable, Union
+
+from lexi.utils.writer import Writer
+
+INDEX_FORMAT: int
+
+class LexiconIndex:
+    path: Path
+
+    def __init__(self, path: Path, writer: Writer) -> None: ...
+    def load(self) -> None: ...
+    def lookup(self, path: Union[str, os.PathLike]) -> Union[dict, None]: ...
+    def update(
+        self, path: Union[str, os.PathLike], lexicon_id: str, name: str, words: int
+    ) -> None: ...
+    def set_export(self, path: Union[str, os.PathLike], checksum_: str) -> None: ...
+    def is_exported(self, path: Union[str, os.PathLike], checksum_: str) -> bool: ...
+    def remove(self, path: Union[str, os.PathLike]) -> None: ...
+    def prune(self, paths: Iterable[Union[str, os.PathLike]]) -> None: ...
+    def flush(self) -> None: ...
+
+def checksum(data: bytes) -> str: ...
+def checksum_file(file: BinaryIO) -> str: ...
@@ -3,10 +3,9 @@
 import os
 from pathlib import Path
 
-import yaml
-
 from lexi import shared
 from lexi.logging.logger import logger
+from lexi.utils import durable, serialization, shards, storage
 
 
 def migrate_v2() -> None:
@@ -34,30 +33,43 @@ def migrate_v2() -> None:
 
     # Migrate lexicons
     logger.info("Migrating lexicons to v2")
-    for file in Path(os.path.join(shared.data_dir, "lexicons")).iterdir():
-        lexicon = open(str(file), "r+", encoding="utf-8")
-        lexicon_data = yaml.safe_load(lexicon)
+    for file in list(Path(os.path.join(shared.data_dir, "lexicons")).glob("*.yaml")):
+        with open(str(file), "r", encoding="utf-8") as lexicon:
+            lexicon_data = serialization.load(lexicon)
         for index, word in enumerate(lexicon_data["words"]):
             existed_types = [key for key, value in word["types"].items() if value]
             lexicon_data["words"][index]["types"] = existed_types
             word["tags"] = []
-        lexicon.seek(0)
-        lexicon.truncate(0)
-        yaml.dump(
-            lexicon_data, lexicon, sort_keys=False, encoding=None, allow_unicode=True
-        )
-        lexicon.close()
+        durable.write(file, serialization.dump(lexicon_data))
         logger.info("Lexicon %s migrated to v2", lexicon_data["name"])
 
     # Bump version of the config file
     config["version"] = 2
-    shared.config_file.seek(0)
-    shared.config_file.truncate(0)
-    yaml.dump(
-        config,
-        shared.config_file,
-        sort_keys=False,
-        encoding=None,
-        allow_unicode=True,
+    durable.write(
+        os.path.join(shared.data_dir, "config.yaml"),
+        serialization.dump(config),
     )
     logger.info("Migration to v2 completed")
+
+
+def migrate_v3() -> None:
+    # Split words of lexicons into shards
+    logger.info("Migrating lexicons to v3")
+    lexicons_dir = Path(shared.data_dir, "lexicons")
+    with durable.batch():
+        for file in list(lexicons_dir.glob("*.yaml")):
+            with open(str(file), "r", encoding="utf-8") as lexicon:
+                lexicon_data = serialization.load(lexicon)
+            if shards.is_manifest(lexicon_data):
+                continue
+            storage.write_sharded(file, lexicon_data)
+            logger.info("Lexicon %s migrated to v3", lexicon_data["name"])
+
+    # Bump version of the config file
+    config: dict = shared.config
+    config["version"] = 3
+    durable.write(
+        os.path.join(shared.data_dir, "config.yaml"),
+        serialization.dump(config),
+    )
+    logger.info("Migration to v3 completed")
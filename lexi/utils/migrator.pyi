@@ -1,3 +1,4 @@
 # pylint: disable=all
 
 def migrate_v2() -> None: ...
+def migrate_v3() -> None: ...
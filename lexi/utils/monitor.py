@@ -0,0 +1,134 @@
+"""Watching the lexicons directory for Lexicon files changed by other programs"""
+
+import os
+from typing import Callable, Union
+
+from gi.repository import Gio, GLib
+
+from lexi.logging.logger import logger
+from lexi.utils import shards
+
+# Quiet period after the last event of a file before it's reported, so files are
+# read once they're completely written
+SETTLE_DELAY = 500  # ms
+# Delay before retrying the files the callback couldn't handle yet
+RETRY_DELAY = 1000  # ms
+
+
+class LexiconsMonitor:
+    """Reports Lexicon files created, changed or removed in the lexicons directory
+
+    Changes of the journals and of the files in the `<id>.shards` directories are
+    reported as changes of their `<id>.yaml` Lexicon files
+
+    Parameters
+    ----------
+    directory : str
+        Path of the lexicons directory
+    callback : Callable[[set[str]], bool]
+        Called in the main loop with the paths of the changed Lexicon files. Returns
+        `False` if the files can't be handled yet, they're reported again later then
+    """
+
+    def __init__(self, directory: str, callback: Callable[[set[str]], bool]) -> None:
+        self._callback = callback
+        self._paths: set[str] = set()
+        self._source_id: int = None
+        # Monitors of the shards directories by their paths
+        self._shard_monitors: dict[str, Gio.FileMonitor] = {}
+        self._monitor = self.__watch(directory)
+        for entry in os.scandir(directory):
+            if entry.name.endswith(shards.SHARDS_SUFFIX) and entry.is_dir():
+                self.__watch_shards(entry.path)
+        logger.debug("Watching “%s” for changes", directory)
+
+    def cancel(self) -> None:
+        """Stop watching the directory and drop the unreported changes"""
+        self._monitor.cancel()
+        for monitor in self._shard_monitors.values():
+            monitor.cancel()
+        self._shard_monitors.clear()
+        if self._source_id is not None:
+            GLib.source_remove(self._source_id)
+            self._source_id = None
+        self._paths.clear()
+
+    def __on_changed(
+        self,
+        _monitor: Gio.FileMonitor,
+        file: Gio.File,
+        other_file: Gio.File,
+        event: Gio.FileMonitorEvent,
+    ) -> None:
+        if event not in (
+            Gio.FileMonitorEvent.CHANGED,
+            Gio.FileMonitorEvent.CHANGES_DONE_HINT,
+            Gio.FileMonitorEvent.CREATED,
+            Gio.FileMonitorEvent.DELETED,
+            Gio.FileMonitorEvent.RENAMED,
+            Gio.FileMonitorEvent.MOVED_IN,
+            Gio.FileMonitorEvent.MOVED_OUT,
+        ):
+            return
+        paths = {file.get_path()}
+        if other_file is not None:
+            paths.add(other_file.get_path())
+        for path in paths:
+            if path.endswith(shards.SHARDS_SUFFIX):
+                self.__update_shards_watch(path)
+        paths = {_lexicon_path(path) for path in paths} - {None}
+        if paths:
+            self._paths |= paths
+            self.__arm(SETTLE_DELAY)
+
+    def __watch(self, directory: str) -> Gio.FileMonitor:
+        monitor = Gio.File.new_for_path(directory).monitor_directory(
+            Gio.FileMonitorFlags.WATCH_MOVES, None
+        )
+        monitor.connect("changed", self.__on_changed)
+        return monitor
+
+    def __watch_shards(self, directory: str) -> None:
+        if directory not in self._shard_monitors:
+            self._shard_monitors[directory] = self.__watch(directory)
+
+    def __update_shards_watch(self, directory: str) -> None:
+        """Start or stop watching a shards directory created or removed"""
+        if os.path.isdir(directory):
+            self.__watch_shards(directory)
+            return
+        monitor = self._shard_monitors.pop(directory, None)
+        if monitor is not None:
+            monitor.cancel()
+
+    def __arm(self, delay: int) -> None:
+        if self._source_id is not None:
+            GLib.source_remove(self._source_id)
+        self._source_id = GLib.timeout_add(delay, self.__on_settled)
+
+    def __on_settled(self) -> bool:
+        self._source_id = None
+        paths, self._paths = self._paths, set()
+        if not self._callback(paths):
+            self._paths |= paths
+            self.__arm(RETRY_DELAY)
+        return GLib.SOURCE_REMOVE
+
+
+def _lexicon_path(path: str) -> Union[str, None]:
+    """Return the path of the Lexicon file `path` belongs to, None for other files"""
+    directory, name = os.path.split(path)
+    # Temporary files of atomic writes are hidden
+    if name.startswith("."):
+        return None
+    if directory.endswith(shards.SHARDS_SUFFIX):
+        if not name.endswith(".yaml"):
+            return None
+        return directory.removesuffix(shards.SHARDS_SUFFIX) + ".yaml"
+    if name.endswith(".yaml"):
+        return path
+    if name.endswith(".journal"):
+        # Both `<id>.journal` and the rotated `<id>.rotated.journal`
+        lexicon_id = name.removesuffix(".journal").removesuffix(".rotated")
+        return os.path.join(directory, lexicon_id + ".yaml")
+    return None
@@ -0,0 +1,11 @@
+# pylint: disable=all
+from typing import Callable
+
+SETTLE_DELAY: int
+RETRY_DELAY: int
+
+class LexiconsMonitor:
+    def __init__(
+        self, directory: str, callback: Callable[[set[str]], bool]
+    ) -> None: ...
+    def cancel(self) -> None: ...
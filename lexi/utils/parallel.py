@@ -0,0 +1,78 @@
+"""Parallel parsing of Lexicon files in worker processes
+
+The module doesn't depend on GObject or the app state, so the worker processes only
+import it together with the YAML serialization
+"""
+
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Union
+
+from lexi.utils import serialization
+
+
+def workers_count(workers: int, jobs: int) -> int:
+    """Return the number of worker processes to use
+
+    Parameters
+    ----------
+    workers : int
+        Requested number of workers, 0 for one worker per CPU
+    jobs : int
+        Number of files to parse
+
+    Returns
+    -------
+    int
+        Number of workers, never more than `jobs`
+    """
+    if workers == 0:
+        workers = os.cpu_count() or 1
+    return max(1, min(workers, jobs))
+
+
+def parse_files(
+    paths: list[Union[str, os.PathLike]], workers: int
+) -> dict[Union[str, os.PathLike], dict]:
+    """Parse YAML files, in parallel if more than one worker should be used
+
+    Workers are started with the `spawn` method, since forking a process with
+    running GLib threads is unsafe. The parsed data is sent back to the calling
+    process, where the Lexicon objects should be built
+
+    Parameters
+    ----------
+    paths : list[str | os.PathLike]
+        Paths of the files to parse
+    workers : int
+        Number of worker processes, 0 for one worker per CPU, 1 to parse the files
+        sequentially in the calling process
+
+    Returns
+    -------
+    dict[str | os.PathLike, dict]
+        Parsed data by the file paths
+
+    Raises
+    ------
+    OSError
+        If the worker processes can't be started or a file can't be read
+    concurrent.futures.process.BrokenProcessPool
+        If a worker process died
+    yaml.YAMLError
+        If a file is not valid YAML
+    """
+    workers = workers_count(workers, len(paths))
+    if workers == 1:
+        return {path: _parse(path) for path in paths}
+
+    with ProcessPoolExecutor(
+        max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+    ) as executor:
+        return dict(zip(paths, executor.map(_parse, paths)))
+
+
+def _parse(path: Union[str, os.PathLike]) -> dict:
+    with open(path, "r", encoding="utf-8") as file:
+        return serialization.load(file)
@@ -0,0 +1,8 @@
+# pylint: disable=all
+import os
+from typing import Union
+
+def workers_count(workers: int, jobs: int) -> int: ...
+def parse_files(
+    paths: list[Union[str, os.PathLike]], workers: int
+) -> dict[Union[str, os.PathLike], dict]: ...
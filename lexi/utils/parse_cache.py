@@ -0,0 +1,215 @@
+"""Binary cache of parsed Lexicon snapshots, sparing YAML parsing on startup
+
+Every cache entry starts with a key made of the cache format, `shared.CACHEV`, the
+path, size and modification time of the Lexicon file, followed by the Lexicon header
+and the words, so the header can be read without the words. All three are serialized
+with `marshal`. An entry whose key doesn't match the Lexicon file is ignored and
+rebuilt on the next load. Shards of sharded Lexicons are cached the same way, with
+an empty header
+"""
+
+import marshal
+import os
+import tempfile
+from pathlib import Path
+from typing import Iterable, Union
+
+from lexi import shared
+from lexi.logging.logger import logger
+from lexi.utils import durable, shards
+
+# Bump on any change of the cache entry layout
+CACHE_FORMAT = 2
+CACHE_SUFFIX = ".cache"
+
+
+def cache_dir() -> str:
+    """Return the directory with the cache entries"""
+    return os.path.join(shared.cache_dir, "lexi", "parse-cache")
+
+
+def load(path: Union[str, os.PathLike], stat: os.stat_result) -> Union[dict, None]:
+    """Return the cached data of the Lexicon file at `path`
+
+    Parameters
+    ----------
+    path : str | os.PathLike
+        Path of the Lexicon file
+    stat : os.stat_result
+        Current status of the Lexicon file
+
+    Returns
+    -------
+    dict | None
+        Lexicon data if the cache entry is valid, None otherwise
+    """
+    data = _read(path, stat, header_only=False)
+    if data is not None:
+        logger.debug("Loaded “%s” from the parse cache", path)
+    return data
+
+
+def load_header(
+    path: Union[str, os.PathLike], stat: os.stat_result
+) -> Union[dict, None]:
+    """Return the cached header of the Lexicon file at `path`, without the words
+
+    Parameters
+    ----------
+    path : str | os.PathLike
+        Path of the Lexicon file
+    stat : os.stat_result
+        Current status of the Lexicon file
+
+    Returns
+    -------
+    dict | None
+        Lexicon header if the cache entry is valid, None otherwise
+    """
+    return _read(path, stat, header_only=True)
+
+
+def is_valid(path: Union[str, os.PathLike], stat: os.stat_result) -> bool:
+    """Return whether the cache entry of the Lexicon file at `path` is valid
+
+    Parameters
+    ----------
+    path : str | os.PathLike
+        Path of the Lexicon file
+    stat : os.stat_result
+        Current status of the Lexicon file
+
+    Returns
+    -------
+    bool
+        True if the entry exists and matches the file, False otherwise
+    """
+    try:
+        with open(_entry_path(path), "rb") as file:
+            return marshal.load(file) == _key(path, stat.st_size, stat.st_mtime_ns)
+    except (OSError, EOFError, ValueError, TypeError):
+        return False
+
+
+def store(path: Union[str, os.PathLike], data: dict) -> None:
+    """Store the parsed data of the Lexicon file at `path`
+
+    The data is serialized immediately, but written only after the Lexicon file
+    write is committed, so the entry is keyed by the final size and modification time
+    of the file
+
+    Parameters
+    ----------
+    path : str | os.PathLike
+        Path of the Lexicon file
+    data : dict
+        Lexicon data, matching the content of the file
+    """
+    header = {key: value for key, value in data.items() if key != "words"}
+    store_marshalled(path, header, marshal.dumps(data.get("words", [])))
+
+
+def store_marshalled(path: Union[str, os.PathLike], header: dict, words: bytes) -> None:
+    """Store the Lexicon data of the file at `path` with already marshalled words
+
+    Parameters
+    ----------
+    path : str | os.PathLike
+        Path of the Lexicon file
+    header : dict
+        Lexicon header
+    words : bytes
+        Lexicon words serialized with `marshal`
+    """
+    payload = marshal.dumps(header) + words
+    durable.after_commit(lambda: _write(path, payload))
+
+
+def evict(path: Union[str, os.PathLike]) -> None:
+    """Remove the cache entry of the Lexicon file at `path`
+
+    Parameters
+    ----------
+    path : str | os.PathLike
+        Path of the Lexicon file
+    """
+    try:
+        os.remove(_entry_path(path))
+    except FileNotFoundError:
+        pass
+
+
+def prune(paths: Iterable[Union[str, os.PathLike]]) -> None:
+    """Remove the cache entries of all Lexicon files except `paths`
+
+    Entries of the shards of the kept Lexicons are kept too
+
+    Parameters
+    ----------
+    paths : Iterable[str | os.PathLike]
+        Paths of the existing Lexicon files
+    """
+    kept = {Path(path).stem for path in paths}
+    try:
+        files = os.listdir(cache_dir())
+    except FileNotFoundError:
+        return
+    for file in files:
+        if file.partition(".")[0] not in kept:
+            logger.debug("Evicting stale parse cache entry “%s”", file)
+            try:
+                os.remove(os.path.join(cache_dir(), file))
+            except FileNotFoundError:
+                pass
+
+
+def _read(
+    path: Union[str, os.PathLike], stat: os.stat_result, header_only: bool
+) -> Union[dict, None]:
+    try:
+        with open(_entry_path(path), "rb") as file:
+            if marshal.load(file) != _key(path, stat.st_size, stat.st_mtime_ns):
+                logger.debug("Parse cache of “%s” is stale", path)
+                return None
+            data = marshal.load(file)
+            if not header_only:
+                data["words"] = marshal.load(file)
+    except FileNotFoundError:
+        return None
+    except (OSError, EOFError, ValueError, TypeError) as e:
+        logger.warning("Failed to read the parse cache of “%s”: %s", path, e)
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def _key(path: Union[str, os.PathLike], size: int, mtime_ns: int) -> tuple:
+    return (CACHE_FORMAT, shared.CACHEV, os.fspath(path), size, mtime_ns)
+
+
+def _entry_path(path: Union[str, os.PathLike]) -> str:
+    path = Path(path)
+    name = path.stem
+    if path.parent.suffix == shards.SHARDS_SUFFIX:
+        # Shard names repeat across Lexicons, prefix them with the Lexicon id
+        name = f"{path.parent.stem}.{name}"
+    return os.path.join(cache_dir(), name + CACHE_SUFFIX)
+
+
+def _write(path: Union[str, os.PathLike], payload: bytes) -> None:
+    try:
+        stat = os.stat(path)
+        os.makedirs(cache_dir(), exist_ok=True)
+        # The cache can always be rebuilt, so it's replaced atomically but not synced
+        fd, tmp_path = tempfile.mkstemp(
+            prefix=".", suffix=durable.TMP_SUFFIX, dir=cache_dir()
+        )
+        try:
+            with os.fdopen(fd, "wb") as file:
+                marshal.dump(_key(path, stat.st_size, stat.st_mtime_ns), file)
+                file.write(payload)
+            os.replace(tmp_path, _entry_path(path))
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+    except OSError as e:
+        logger.warning("Failed to write the parse cache of “%s”: %s", path, e)
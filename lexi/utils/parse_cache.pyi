@@ -0,0 +1,19 @@
+# pylint: disable=all
+import os
+from typing import Iterable, Union
+
+CACHE_FORMAT: int
+CACHE_SUFFIX: str
+
+def cache_dir() -> str: ...
+def load(path: Union[str, os.PathLike], stat: os.stat_result) -> Union[dict, None]: ...
+def load_header(
+    path: Union[str, os.PathLike], stat: os.stat_result
+) -> Union[dict, None]: ...
+def is_valid(path: Union[str, os.PathLike], stat: os.stat_result) -> bool: ...
+def store(path: Union[str, os.PathLike], data: dict) -> None: ...
+def store_marshalled(
+    path: Union[str, os.PathLike], header: dict, words: bytes
+) -> None: ...
+def evict(path: Union[str, os.PathLike]) -> None: ...
+def prune(paths: Iterable[Union[str, os.PathLike]]) -> None: ...
@@ -0,0 +1,96 @@
+"""Deferred saving of the Lexicons, so bursts of changes are written once"""
+
+from gi.repository import GLib
+
+from lexi import enums
+from lexi.logging.logger import logger
+from lexi.utils import durable
+
+
+class SaveScheduler:
+    """Coalesces bursts of `Lexicon.save()` calls into a single write per Lexicon
+
+    A write happens once no new saves were requested for the `save-delay` quiet
+    period, but no later than `save-max-delay` after the first unsaved change
+    """
+
+    def __init__(self) -> None:
+        # Lexicons with unsaved changes by their ids
+        self._pending = {}
+        self._quiet_source_id: int = None
+        self._deadline_source_id: int = None
+
+    def schedule(self, lexicon) -> None:
+        """Schedule a save of the given lexicon
+
+        Parameters
+        ----------
+        lexicon : Lexicon
+            Lexicon to save
+        """
+        if enums.Schema.SAVE_DELAY() <= 0:
+            lexicon._save()  # pylint: disable=protected-access
+            return
+
+        self._pending[lexicon.id] = lexicon
+        if self._quiet_source_id is not None:
+            GLib.source_remove(self._quiet_source_id)
+        self._quiet_source_id = GLib.timeout_add(
+            enums.Schema.SAVE_DELAY(), self.__on_quiet_timeout
+        )
+        if self._deadline_source_id is None:
+            self._deadline_source_id = GLib.timeout_add(
+                max(enums.Schema.SAVE_MAX_DELAY(), enums.Schema.SAVE_DELAY()),
+                self.__on_deadline_timeout,
+            )
+
+    def flush(self) -> None:
+        """Immediately save all lexicons with pending changes"""
+        self.__cancel_timeouts()
+        pending = list(self._pending.values())
+        self._pending.clear()
+        with durable.batch():
+            for lexicon in pending:
+                logger.debug("Saving lexicon “%s”", lexicon.name)
+                try:
+                    lexicon._save()  # pylint: disable=protected-access
+                except OSError as e:
+                    logger.error("Failed to save lexicon “%s”: %s", lexicon.name, e)
+
+    def discard(self, lexicon=None) -> None:
+        """Drop pending saves without writing them
+
+        Parameters
+        ----------
+        lexicon : Lexicon, optional
+            Lexicon to drop the pending save for, all pending saves are dropped if None
+        """
+        if lexicon is None:
+            self._pending.clear()
+        else:
+            self._pending.pop(lexicon.id, None)
+        if not self._pending:
+            self.__cancel_timeouts()
+
+    @property
+    def pending(self) -> bool:
+        """Whether there are any unsaved lexicons"""
+        return bool(self._pending)
+
+    def __on_quiet_timeout(self) -> bool:
+        self._quiet_source_id = None
+        self.flush()
+        return GLib.SOURCE_REMOVE
+
+    def __on_deadline_timeout(self) -> bool:
+        self._deadline_source_id = None
+        self.flush()
+        return GLib.SOURCE_REMOVE
+
+    def __cancel_timeouts(self) -> None:
+        if self._quiet_source_id is not None:
+            GLib.source_remove(self._quiet_source_id)
+            self._quiet_source_id = None
+        if self._deadline_source_id is not None:
+            GLib.source_remove(self._deadline_source_id)
+            self._deadline_source_id = None
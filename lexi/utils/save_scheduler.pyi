@@ -0,0 +1,12 @@
+# pylint: disable=all
+from typing import Union
+
+from lexi.utils.backend import Lexicon
+
+class SaveScheduler:
+    def __init__(self) -> None: ...
+    def schedule(self, lexicon: Lexicon) -> None: ...
+    def flush(self) -> None: ...
+    def discard(self, lexicon: Union[Lexicon, None] = None) -> None: ...
+    @property
+    def pending(self) -> bool: ...
@@ -0,0 +1,461 @@
+"""Indexes for searching the words of a Lexicon without scanning all of them
+
+The module doesn't depend on GObject or the app state, the words are identified by
+their ids only
+"""
+
+import bisect
+import math
+import re
+from collections import Counter
+from typing import Iterable
+
+# Length of the indexed substrings
+TRIGRAM = 3
+# BM25 parameters: saturation of the term frequencies and length normalization
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+_TOKEN_RE = re.compile(r"\w+")
+
+
+def normalize(text: str) -> str:
+    """Return the searchable form of a word or translation"""
+    return text.lower().replace("&rtl", "")
+
+
+def edit_distance(a: str, b: str) -> int:
+    """Return the Levenshtein distance between two texts
+
+    Computed with the bit-parallel algorithm of Myers, a column of the distance
+    matrix is kept in the bits of integers
+    """
+    if not a or not b:
+        return len(a) + len(b)
+    # Positions of the characters in `a` as bitmasks
+    peq: dict[str, int] = {}
+    for i, char in enumerate(a):
+        peq[char] = peq.get(char, 0) | 1 << i
+    full = (1 << len(a)) - 1
+    last = 1 << (len(a) - 1)
+    pv, mv, distance = full, 0, len(a)
+    for char in b:
+        eq = peq.get(char, 0)
+        xv = eq | mv
+        xh = (((eq & pv) + pv) ^ pv) | eq
+        ph = mv | ~(xh | pv)
+        mh = pv & xh
+        if ph & last:
+            distance += 1
+        elif mh & last:
+            distance -= 1
+        ph = ph << 1 | 1
+        mh <<= 1
+        pv = (mh | ~(xv | ph)) & full
+        mv = ph & xv & full
+    return distance
+
+
+def tokenize(text: str) -> list[str]:
+    """Return the normalized words of a text, see `normalize()`"""
+    return _TOKEN_RE.findall(normalize(text))
+
+
+def trigrams(text: str) -> set[str]:
+    """Return all substrings of the text with the `TRIGRAM` length"""
+    return {text[i : i + TRIGRAM] for i in range(len(text) - TRIGRAM + 1)}
+
+
+class TrigramIndex:
+    """Substring search over short texts of the words
+
+    Every trigram of the texts maps to the ids of the words containing it. Candidates
+    for a query are the words containing all of its trigrams, they're verified
+    against the texts afterwards. Queries shorter than a trigram are checked against
+    all texts
+
+    Parameters
+    ----------
+    words : Iterable[tuple[int, Iterable[str]]], optional
+        IDs of the words with their normalized texts to index
+    """
+
+    def __init__(self, words: Iterable[tuple[int, Iterable[str]]] = ()) -> None:
+        self._postings: dict[str, set[int]] = {}
+        self._texts: dict[int, tuple[str, ...]] = {}
+        postings = self._postings
+        for word_id, texts in words:
+            self._texts[word_id] = texts = tuple(texts)
+            for text in texts:
+                for i in range(len(text) - TRIGRAM + 1):
+                    trigram = text[i : i + TRIGRAM]
+                    if trigram in postings:
+                        postings[trigram].add(word_id)
+                    else:
+                        postings[trigram] = {word_id}
+
+    def __len__(self) -> int:
+        return len(self._texts)
+
+    def add(self, word_id: int, texts: Iterable[str]) -> None:
+        """Index the normalized texts of a word, replacing its previous texts
+
+        Parameters
+        ----------
+        word_id : int
+            ID of the word
+        texts : Iterable[str]
+            Normalized texts of the word, see `normalize()`
+        """
+        texts = tuple(texts)
+        old = self._texts.get(word_id)
+        if old == texts:
+            return
+        old_trigrams = set().union(*map(trigrams, old)) if old else set()
+        new_trigrams = set().union(*map(trigrams, texts))
+        for trigram in old_trigrams - new_trigrams:
+            self.__unpost(trigram, word_id)
+        for trigram in new_trigrams - old_trigrams:
+            self._postings.setdefault(trigram, set()).add(word_id)
+        self._texts[word_id] = texts
+
+    def remove(self, word_id: int) -> None:
+        """Remove a word from the index
+
+        Parameters
+        ----------
+        word_id : int
+            ID of the word
+        """
+        texts = self._texts.pop(word_id, None)
+        if texts:
+            for trigram in set().union(*map(trigrams, texts)):
+                self.__unpost(trigram, word_id)
+
+    def search(self, query: str) -> set[int]:
+        """Return the ids of the words with a text containing the query
+
+        Parameters
+        ----------
+        query : str
+            Normalized query, see `normalize()`
+
+        Returns
+        -------
+        set[int]
+            IDs of the matching words
+        """
+        if len(query) < TRIGRAM:
+            candidates = self._texts.keys()
+        else:
+            # Intersecting from the rarest trigram keeps the intermediate sets small
+            postings = sorted(
+                (self._postings.get(trigram, set()) for trigram in trigrams(query)),
+                key=len,
+            )
+            candidates = postings[0].intersection(*postings[1:])
+        return {
+            word_id
+            for word_id in candidates
+            if any(query in text for text in self._texts[word_id])
+        }
+
+    def __unpost(self, trigram: str, word_id: int) -> None:
+        posting = self._postings[trigram]
+        posting.discard(word_id)
+        if not posting:
+            del self._postings[trigram]
+
+
+class _BKNode:
+    __slots__ = ("text", "ids", "children")
+
+    def __init__(self, text: str) -> None:
+        self.text = text
+        self.ids: set[int] = set()
+        self.children: dict[int, "_BKNode"] = {}
+
+
+class BKTree:
+    """Typo tolerant search over the headwords of the words
+
+    A BK-tree of the distinct normalized headwords, ordered by their edit distances.
+    Only the subtrees which can hold texts within the searched distance are visited.
+    Nodes of texts without words are kept, so they're reused if the texts return,
+    until they make up half of the nodes and the tree is rebuilt without them
+    """
+
+    def __init__(self) -> None:
+        self._root: _BKNode = None
+        self._nodes: dict[str, _BKNode] = {}
+        self._texts: dict[int, str] = {}
+        # Number of nodes without words
+        self._empty: int = 0
+
+    def __len__(self) -> int:
+        return len(self._texts)
+
+    def add(self, word_id: int, text: str) -> None:
+        """Index the normalized headword of a word, replacing its previous headword
+
+        Parameters
+        ----------
+        word_id : int
+            ID of the word
+        text : str
+            Normalized headword, see `normalize()`
+        """
+        if self._texts.get(word_id) == text:
+            return
+        self.remove(word_id)
+        self._texts[word_id] = text
+        node = self._nodes.get(text)
+        if node is None:
+            node = self._nodes[text] = _BKNode(text)
+            self.__insert(node)
+        elif not node.ids:
+            self._empty -= 1
+        node.ids.add(word_id)
+
+    def remove(self, word_id: int) -> None:
+        """Remove a word from the tree
+
+        Parameters
+        ----------
+        word_id : int
+            ID of the word
+        """
+        text = self._texts.pop(word_id, None)
+        if text is None:
+            return
+        node = self._nodes[text]
+        node.ids.discard(word_id)
+        if not node.ids:
+            self._empty += 1
+            if self._empty * 2 > len(self._nodes):
+                self.__rebuild()
+
+    def search(self, query: str, distance: int) -> dict[int, int]:
+        """Return the words with headwords within the edit distance of the query
+
+        Parameters
+        ----------
+        query : str
+            Normalized query, see `normalize()`
+        distance : int
+            Maximum edit distance
+
+        Returns
+        -------
+        dict[int, int]
+            Edit distances of the matching words by their ids
+        """
+        found = {}
+        stack = [self._root] if self._root is not None else []
+        while stack:
+            node = stack.pop()
+            node_distance = edit_distance(query, node.text)
+            if node_distance <= distance:
+                found.update(dict.fromkeys(node.ids, node_distance))
+            for edge in range(node_distance - distance, node_distance + distance + 1):
+                child = node.children.get(edge)
+                if child is not None:
+                    stack.append(child)
+        return found
+
+    def __rebuild(self) -> None:
+        nodes = [node for node in self._nodes.values() if node.ids]
+        self._root = None
+        self._nodes = {}
+        self._empty = 0
+        for node in nodes:
+            node.children = {}
+            self._nodes[node.text] = node
+            self.__insert(node)
+
+    def __insert(self, new: _BKNode) -> None:
+        if self._root is None:
+            self._root = new
+            return
+        node = self._root
+        while True:
+            edge = edit_distance(new.text, node.text)
+            child = node.children.get(edge)
+            if child is None:
+                node.children[edge] = new
+                return
+            node = child
+
+
+class PrefixIndex:
+    """Completion of the headwords of the words
+
+    The normalized headwords are kept in a sorted array, so the headwords with a
+    prefix are a contiguous run found by bisection
+
+    Parameters
+    ----------
+    words : Iterable[tuple[int, str]], optional
+        IDs of the words with their normalized headwords to index
+    """
+
+    def __init__(self, words: Iterable[tuple[int, str]] = ()) -> None:
+        self._texts: dict[int, str] = dict(words)
+        # Headwords with the ids of their words, sorted
+        self._keys: list[tuple[str, int]] = sorted(
+            (text, word_id) for word_id, text in self._texts.items()
+        )
+
+    def __len__(self) -> int:
+        return len(self._texts)
+
+    def add(self, word_id: int, text: str) -> None:
+        """Index the normalized headword of a word, replacing its previous headword
+
+        Parameters
+        ----------
+        word_id : int
+            ID of the word
+        text : str
+            Normalized headword, see `normalize()`
+        """
+        if self._texts.get(word_id) == text:
+            return
+        self.remove(word_id)
+        self._texts[word_id] = text
+        bisect.insort(self._keys, (text, word_id))
+
+    def remove(self, word_id: int) -> None:
+        """Remove a word from the index
+
+        Parameters
+        ----------
+        word_id : int
+            ID of the word
+        """
+        text = self._texts.pop(word_id, None)
+        if text is not None:
+            del self._keys[bisect.bisect_left(self._keys, (text, word_id))]
+
+    def complete(self, prefix: str, limit: int) -> list[int]:
+        """Return the words with headwords starting with the prefix
+
+        Parameters
+        ----------
+        prefix : str
+            Normalized prefix, see `normalize()`
+        limit : int
+            Maximum number of the returned words
+
+        Returns
+        -------
+        list[int]
+            IDs of the words in the order of their headwords
+        """
+        start = bisect.bisect_left(self._keys, (prefix,))
+        found = []
+        for text, word_id in self._keys[start : start + limit]:
+            if not text.startswith(prefix):
+                break
+            found.append(word_id)
+        return found
+
+    def contains(self, text: str) -> bool:
+        """Return whether any word has the normalized headword"""
+        i = bisect.bisect_left(self._keys, (text,))
+        return i < len(self._keys) and self._keys[i][0] == text
+
+
+class FullTextIndex:
+    """Ranked search over all texts of the words
+
+    An inverted index of the tokens of the texts with their frequencies in every
+    word. Words with any of the query tokens are found, ranked by the number of the
+    matched tokens and then by their BM25 scores
+    """
+
+    def __init__(self) -> None:
+        # Frequencies of a token in the words by the word ids, by the token
+        self._postings: dict[str, dict[int, int]] = {}
+        self._terms: dict[int, Counter] = {}
+        self._total_length = 0
+
+    def __len__(self) -> int:
+        return len(self._terms)
+
+    def add(self, word_id: int, texts: Iterable[str]) -> None:
+        """Index the texts of a word, replacing its previous texts
+
+        Parameters
+        ----------
+        word_id : int
+            ID of the word
+        texts : Iterable[str]
+            Texts of the word, tokenized by `tokenize()`
+        """
+        terms = Counter(token for text in texts for token in tokenize(text))
+        if self._terms.get(word_id) == terms:
+            return
+        self.remove(word_id)
+        self._terms[word_id] = terms
+        self._total_length += terms.total()
+        for term, frequency in terms.items():
+            self._postings.setdefault(term, {})[word_id] = frequency
+
+    def remove(self, word_id: int) -> None:
+        """Remove a word from the index
+
+        Parameters
+        ----------
+        word_id : int
+            ID of the word
+        """
+        terms = self._terms.pop(word_id, None)
+        if terms is None:
+            return
+        self._total_length -= terms.total()
+        for term in terms:
+            posting = self._postings[term]
+            del posting[word_id]
+            if not posting:
+                del self._postings[term]
+
+    def search(self, query: str) -> dict[int, tuple[int, float]]:
+        """Return the ranks of the words with any of the query tokens
+
+        Parameters
+        ----------
+        query : str
+            Query, tokenized by `tokenize()`
+
+        Returns
+        -------
+        dict[int, tuple[int, float]]
+            Numbers of the matched query tokens and BM25 scores of the found words by
+            their ids, higher ranks are better matches
+        """
+        ranks: dict[int, tuple[int, float]] = {}
+        if not self._terms:
+            return ranks
+        average_length = self._total_length / len(self._terms) or 1
+        for term in set(tokenize(query)):
+            posting = self._postings.get(term)
+            if posting is None:
+                continue
+            idf = math.log(
+                1 + (len(self._terms) - len(posting) + 0.5) / (len(posting) + 0.5)
+            )
+            for word_id, frequency in posting.items():
+                length = self._terms[word_id].total()
+                score = (
+                    idf
+                    * frequency
+                    * (BM25_K1 + 1)
+                    / (
+                        frequency
+                        + BM25_K1 * (1 - BM25_B + BM25_B * length / average_length)
+                    )
+                )
+                matched, total = ranks.get(word_id, (0, 0.0))
+                ranks[word_id] = (matched + 1, total + score)
+        return ranks
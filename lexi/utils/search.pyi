@@ -0,0 +1,40 @@
+# pylint: disable=all
+from typing import Iterable
+
+TRIGRAM: int
+BM25_K1: float
+BM25_B: float
+
+def normalize(text: str) -> str: ...
+def edit_distance(a: str, b: str) -> int: ...
+def tokenize(text: str) -> list[str]: ...
+def trigrams(text: str) -> set[str]: ...
+
+class TrigramIndex:
+    def __init__(self, words: Iterable[tuple[int, Iterable[str]]] = ()) -> None: ...
+    def __len__(self) -> int: ...
+    def add(self, word_id: int, texts: Iterable[str]) -> None: ...
+    def remove(self, word_id: int) -> None: ...
+    def search(self, query: str) -> set[int]: ...
+
+class BKTree:
+    def __init__(self) -> None: ...
+    def __len__(self) -> int: ...
+    def add(self, word_id: int, text: str) -> None: ...
+    def remove(self, word_id: int) -> None: ...
+    def search(self, query: str, distance: int) -> dict[int, int]: ...
+
+class PrefixIndex:
+    def __init__(self, words: Iterable[tuple[int, str]] = ()) -> None: ...
+    def __len__(self) -> int: ...
+    def add(self, word_id: int, text: str) -> None: ...
+    def remove(self, word_id: int) -> None: ...
+    def complete(self, prefix: str, limit: int) -> list[int]: ...
+    def contains(self, text: str) -> bool: ...
+
+class FullTextIndex:
+    def __init__(self) -> None: ...
+    def __len__(self) -> int: ...
+    def add(self, word_id: int, texts: Iterable[str]) -> None: ...
+    def remove(self, word_id: int) -> None: ...
+    def search(self, query: str) -> dict[int, tuple[int, float]]: ...
@@ -0,0 +1,202 @@
+"""YAML (de)serialization, using the libyaml C bindings when they are available"""
+
+from typing import IO, Any, Iterable, Iterator, Union
+
+import yaml
+
+try:
+    from yaml import CSafeDumper as SafeDumper
+    from yaml import CSafeLoader as SafeLoader
+
+    LIBYAML = True
+except ImportError:
+    from yaml import SafeDumper, SafeLoader
+
+    LIBYAML = False
+
+YAMLError = yaml.YAMLError
+
+# Marks the start of the sequence streamed by `_iter_items()`
+_SEQUENCE_START = object()
+
+
+class LazySequence:
+    """Iterable dumped as a YAML sequence without copying its items into a list
+
+    Parameters
+    ----------
+    iterable : Iterable
+        Items of the sequence
+    """
+
+    def __init__(self, iterable: Iterable) -> None:
+        self.iterable = iterable
+
+    def __iter__(self) -> Iterator:
+        return iter(self.iterable)
+
+
+def _represent_lazy_sequence(
+    dumper: yaml.SafeDumper, data: LazySequence
+) -> yaml.SequenceNode:
+    return dumper.represent_sequence("tag:yaml.org,2002:seq", data)
+
+
+class _Dumper(SafeDumper):
+    pass
+
+
+class _PureDumper(yaml.SafeDumper):
+    pass
+
+
+_Dumper.add_representer(LazySequence, _represent_lazy_sequence)
+_PureDumper.add_representer(LazySequence, _represent_lazy_sequence)
+
+
+def load(stream: Union[str, bytes, IO], pure: bool = False) -> Any:
+    """Parse a YAML document
+
+    Parameters
+    ----------
+    stream : str | bytes | IO
+        YAML document or a file object to read it from
+    pure : bool, optional
+        Use the pure Python loader even if libyaml is available, by default False
+
+    Returns
+    -------
+    Any
+        Parsed document
+    """
+    return yaml.load(stream, Loader=yaml.SafeLoader if pure else SafeLoader)
+
+
+def dump(data: Any, stream: Union[IO, None] = None, pure: bool = False) -> str:
+    """Serialize `data` to a YAML document in the format of the Lexi data files
+
+    Keys are kept in insertion order and non-ASCII characters are written as is.
+    `LazySequence` items are dumped as sequences
+
+    Parameters
+    ----------
+    data : Any
+        Data to serialize
+    stream : IO, optional
+        File object to write the document to, by default the document is returned
+    pure : bool, optional
+        Use the pure Python dumper even if libyaml is available, by default False
+
+    Returns
+    -------
+    str
+        The document, if `stream` wasn't given
+    """
+    return yaml.dump(
+        data,
+        stream,
+        Dumper=_PureDumper if pure else _Dumper,
+        sort_keys=False,
+        encoding=None,
+        allow_unicode=True,
+    )
+
+
+def load_streamed(stream: Union[str, bytes, IO], key: Any, pure: bool = False) -> dict:
+    """Parse a YAML mapping document, building the `key` sequence item by item
+
+    Objects are built straight from the parser events, so unlike with `load()` the
+    node tree of the whole document is never composed, which also makes parsing
+    faster. The whole parsed document is still returned. Merge keys are not supported
+
+    Parameters
+    ----------
+    stream : str | bytes | IO
+        YAML document or a file object to read it from
+    key : Any
+        Top-level key with a sequence, parsed item by item
+    pure : bool, optional
+        Use the pure Python parser even if libyaml is available, by default False
+
+    Returns
+    -------
+    dict
+        Parsed document, the same as returned by `load()`
+
+    Raises
+    ------
+    yaml.YAMLError
+        If the document is not valid YAML or not a mapping
+    """
+    data = {}
+    for item_key, value in _iter_items(stream, key, pure):
+        if value is _SEQUENCE_START:
+            data[key] = []
+        elif item_key == key:
+            data[key].append(value)
+        else:
+            data[item_key] = value
+    return data
+
+
+def _iter_items(
+    stream: Union[str, bytes, IO], key: Any, pure: bool
+) -> Iterator[tuple[Any, Any]]:
+    # Yields the top-level items as `(key, value)` pairs and the items of the `key`
+    # sequence one by one, preceded by `_SEQUENCE_START`, so an empty sequence can be
+    # told apart from a missing one
+    loader = (yaml.SafeLoader if pure else SafeLoader)(stream)
+    anchors = {}
+    try:
+        loader.get_event()  # StreamStartEvent
+        loader.get_event()  # DocumentStartEvent
+        event = loader.get_event()
+        if not isinstance(event, yaml.MappingStartEvent):
+            raise yaml.YAMLError(f"Expected a mapping document, got {event}")
+        while not loader.check_event(yaml.MappingEndEvent):
+            item_key = _construct(loader, anchors)
+            if item_key == key and loader.check_event(yaml.SequenceStartEvent):
+                loader.get_event()
+                yield item_key, _SEQUENCE_START
+                while not loader.check_event(yaml.SequenceEndEvent):
+                    yield item_key, _construct(loader, anchors)
+                loader.get_event()
+            else:
+                yield item_key, _construct(loader, anchors)
+    finally:
+        loader.dispose()
+
+
+def _construct(loader: yaml.SafeLoader, anchors: dict[str, Any]) -> Any:
+    # Build the next node straight from the parser events, without composing nodes
+    event = loader.get_event()
+    if isinstance(event, yaml.AliasEvent):
+        return anchors[event.anchor]
+    if not isinstance(event, yaml.ScalarEvent):
+        return _construct_collection(loader, anchors, event)
+    tag = event.tag
+    if tag is None or tag == "!":
+        tag = loader.resolve(yaml.ScalarNode, event.value, event.implicit)
+    constructor = loader.yaml_constructors.get(tag, loader.yaml_constructors[None])
+    value = constructor(loader, yaml.ScalarNode(tag, event.value, style=event.style))
+    if event.anchor is not None:
+        anchors[event.anchor] = value
+    return value
+
+
+def _construct_collection(
+    loader: yaml.SafeLoader, anchors: dict[str, Any], event: yaml.NodeEvent
+) -> Union[list, dict]:
+    value = [] if isinstance(event, yaml.SequenceStartEvent) else {}
+    # Registered before the items, which may refer to the collection
+    if event.anchor is not None:
+        anchors[event.anchor] = value
+    if isinstance(value, list):
+        while not loader.check_event(yaml.SequenceEndEvent):
+            value.append(_construct(loader, anchors))
+    else:
+        while not loader.check_event(yaml.MappingEndEvent):
+            item_key = _construct(loader, anchors)
+            value[item_key] = _construct(loader, anchors)
+    loader.get_event()
+    return value
@@ -0,0 +1,19 @@
+# pylint: disable=all
+from typing import IO, Any, Iterable, Iterator, Union
+
+import yaml
+
+LIBYAML: bool
+YAMLError = yaml.YAMLError
+
+class LazySequence:
+    iterable: Iterable
+
+    def __init__(self, iterable: Iterable) -> None: ...
+    def __iter__(self) -> Iterator: ...
+
+def load(stream: Union[str, bytes, IO], pure: bool = False) -> Any: ...
+def dump(data: Any, stream: Union[IO, None] = None, pure: bool = False) -> str: ...
+def load_streamed(
+    stream: Union[str, bytes, IO], key: Any, pure: bool = False
+) -> dict: ...
@@ -0,0 +1,140 @@
+"""Layout of sharded Lexicon files
+
+The words of a sharded Lexicon are split by their id ranges into shard files in the
+`<id>.shards` directory. The Lexicon file itself keeps only the header and a small
+manifest of the shards:
+
+::
+
+    lexicons/<id>.yaml -> id, name, word-count, shard-size and indexes of the shards
+    lexicons/<id>.shards/<n>.yaml -> words with ids from n * shard-size up to
+                                     (n + 1) * shard-size, under the `words` key
+
+Lexicon files with the words stored inline are still read, they are written
+sharded on their next save. The module doesn't depend on GObject or the app state
+"""
+
+import os
+from pathlib import Path
+from typing import Iterable, Union
+
+# Number of word ids per shard of newly sharded Lexicons
+SHARD_SIZE = 1000
+SHARD_SIZE_KEY = "shard-size"
+WORD_COUNT_KEY = "word-count"
+SHARDS_KEY = "shards"
+SHARDS_SUFFIX = ".shards"
+
+
+def is_manifest(data: dict) -> bool:
+    """Return whether the Lexicon file `data` is a manifest of a sharded Lexicon"""
+    return SHARDS_KEY in data
+
+
+def shards_dir(path: Union[str, os.PathLike]) -> Path:
+    """Return the directory with the shards of the Lexicon file at `path`"""
+    return Path(path).with_suffix(SHARDS_SUFFIX)
+
+
+def shard_path(path: Union[str, os.PathLike], index: int) -> Path:
+    """Return the path of the shard with the given index
+
+    Parameters
+    ----------
+    path : str | os.PathLike
+        Path of the Lexicon file
+    index : int
+        Index of the shard
+
+    Returns
+    -------
+    Path
+        Path of the shard file
+    """
+    return shards_dir(path) / f"{index}.yaml"
+
+
+def shard_index(word_id: int, shard_size: int) -> int:
+    """Return the index of the shard keeping the word with `word_id`"""
+    return word_id // shard_size
+
+
+def split(words: Iterable[dict], shard_size: int) -> dict[int, list[dict]]:
+    """Split the words into shards
+
+    Parameters
+    ----------
+    words : Iterable[dict]
+        Words to split
+    shard_size : int
+        Number of word ids per shard
+
+    Returns
+    -------
+    dict[int, list[dict]]
+        Words of the shards by the shard indexes, empty shards are omitted
+    """
+    shards = {}
+    for word in words:
+        shards.setdefault(shard_index(word["id"], shard_size), []).append(word)
+    return shards
+
+
+def manifest(
+    lexicon_header: dict, word_count: int, shard_size: int, indexes: Iterable[int]
+) -> dict:
+    """Return the content of the Lexicon file of a sharded Lexicon
+
+    Parameters
+    ----------
+    lexicon_header : dict
+        Lexicon header, without the words
+    word_count : int
+        Number of words in all shards
+    shard_size : int
+        Number of word ids per shard
+    indexes : Iterable[int]
+        Indexes of the non-empty shards
+
+    Returns
+    -------
+    dict
+        Header with the manifest of the shards
+    """
+    return {
+        **lexicon_header,
+        WORD_COUNT_KEY: word_count,
+        SHARD_SIZE_KEY: shard_size,
+        SHARDS_KEY: sorted(indexes),
+    }
+
+
+def header(data: dict) -> dict:
+    """Return the Lexicon header of a Lexicon file, without the words and manifest"""
+    return {
+        key: value
+        for key, value in data.items()
+        if key not in ("words", WORD_COUNT_KEY, SHARD_SIZE_KEY, SHARDS_KEY)
+    }
+
+
+def stale_shards(path: Union[str, os.PathLike], indexes: Iterable[int]) -> list[Path]:
+    """Return shard files of the Lexicon file at `path` missing in the manifest
+
+    Parameters
+    ----------
+    path : str | os.PathLike
+        Path of the Lexicon file
+    indexes : Iterable[int]
+        Indexes of the shards in the manifest
+
+    Returns
+    -------
+    list[Path]
+        Paths of the shard files which are not in `indexes`
+    """
+    kept = {shard_path(path, index).name for index in indexes}
+    try:
+        return [file for file in shards_dir(path).iterdir() if file.name not in kept]
+    except FileNotFoundError:
+        return []
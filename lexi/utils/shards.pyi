@@ -0,0 +1,23 @@
+# pylint: disable=all
+import os
+from pathlib import Path
+from typing import Iterable, Union
+
+SHARD_SIZE: int
+SHARD_SIZE_KEY: str
+WORD_COUNT_KEY: str
+SHARDS_KEY: str
+SHARDS_SUFFIX: str
+
+def is_manifest(data: dict) -> bool: ...
+def shards_dir(path: Union[str, os.PathLike]) -> Path: ...
+def shard_path(path: Union[str, os.PathLike], index: int) -> Path: ...
+def shard_index(word_id: int, shard_size: int) -> int: ...
+def split(words: Iterable[dict], shard_size: int) -> dict[int, list[dict]]: ...
+def manifest(
+    lexicon_header: dict, word_count: int, shard_size: int, indexes: Iterable[int]
+) -> dict: ...
+def header(data: dict) -> dict: ...
+def stale_shards(
+    path: Union[str, os.PathLike], indexes: Iterable[int]
+) -> list[Path]: ...
@@ -1,13 +1,144 @@
 """Module with methods for `invalidate_sort()` and `invalidate_filter()` methods"""
 
+import math
+from typing import NamedTuple, Union
+
 from gi.repository import Gtk
 
-from lexi import shared
+from lexi import enums, shared
 from lexi.logging.logger import logger
 from lexi.ui.WordRow import WordRow
+from lexi.utils.backend import Lexicon
+
+
+class SearchQuery(NamedTuple):
+    """Query of the words search entry, parsed once per change of its text"""
+
+    # `text`, `tags`, `fuzzy` or `fulltext`
+    mode: str
+    # Query without the mode prefix, lowercased for the `text` mode
+    text: str = ""
+    # Tags of the `tags` mode
+    tags: tuple[str, ...] = ()
+    # Allowed edit distance of the `fuzzy` mode
+    distance: int = 0
+
+
+def parse_query(text: str) -> SearchQuery:
+    """
+    Parse the text of the words search entry
+
+    The allowed edit distance of fuzzy queries grows with the query length, up to
+    the `fuzzy-distance` setting
+
+    Parameters
+    ----------
+    text : str
+        Text of the search entry
+
+    Returns
+    -------
+    SearchQuery
+        Parsed query
+    """
+    if text.startswith("~"):
+        query = text[1:].strip()
+        distance = min(enums.Schema.FUZZY_DISTANCE(), len(query) // 3)
+        return SearchQuery("fuzzy", query, distance=distance)
+    if text.startswith("*"):
+        return SearchQuery("fulltext", text[1:].strip())
+    if text.startswith("#"):
+        tags = text.lower().replace(" ", "").split("#")[1:]
+        return SearchQuery("tags", tags=tuple(tags))
+    return SearchQuery("text", text.lower())
+
+
+def fuzzy_distances(
+    lexicon: Lexicon, query: SearchQuery
+) -> Union[dict[int, int], None]:
+    """
+    Return the results of a fuzzy search query
+
+    Parameters
+    ----------
+    lexicon : Lexicon
+        Lexicon to search
+    query : SearchQuery
+        Parsed query of the search entry
+
+    Returns
+    -------
+    dict[int, int] | None
+        Edit distances of the found words by their ids, None if the query isn't a
+        fuzzy one or is empty
+    """
+    if query.mode != "fuzzy" or not query.text:
+        return None
+    return lexicon.indexes.words_near(query.text, query.distance)
+
+
+def fulltext_ranks(
+    lexicon: Lexicon, query: SearchQuery
+) -> Union[dict[int, tuple[int, float]], None]:
+    """
+    Return the results of a full-text search query
+
+    Parameters
+    ----------
+    lexicon : Lexicon
+        Lexicon to search
+    query : SearchQuery
+        Parsed query of the search entry
+
+    Returns
+    -------
+    dict[int, tuple[int, float]] | None
+        Ranks of the found words by their ids, see `WordIndexes.rank_words()`. None if
+        the query isn't a full-text one or is empty
+    """
+    if query.mode != "fulltext" or not query.text:
+        return None
+    return lexicon.indexes.rank_words(query.text)
 
 
-# pylint: disable=no-else-return
+def compare_matches(row1: WordRow, row2: WordRow, query: SearchQuery) -> int:
+    """
+    Compare words by how well they match a fuzzy or full-text search query
+
+    Parameters
+    ----------
+    row1 : WordRow
+        The first word row to compare
+    row2 : WordRow
+        The second word row to compare
+    query : SearchQuery
+        Parsed query of the search entry
+
+    Returns
+    -------
+    int
+        -1 if row1 is a better match, 1 if row2 is, 0 if they match equally or the
+        query doesn't rank the words
+    """
+    # Fuzzy search results go closest first
+    distances = fuzzy_distances(row1.word.parent_lexicon, query)
+    if distances is not None:
+        distance1 = distances.get(row1.word.id, math.inf)
+        distance2 = distances.get(row2.word.id, math.inf)
+        if distance1 != distance2:
+            return -1 if distance1 < distance2 else 1
+
+    # Full-text search results go best match first
+    ranks = fulltext_ranks(row1.word.parent_lexicon, query)
+    if ranks is not None:
+        rank1 = ranks.get(row1.word.id, (0, 0.0))
+        rank2 = ranks.get(row2.word.id, (0, 0.0))
+        if rank1 != rank2:
+            return -1 if rank1 > rank2 else 1
+    return 0
+
+
+# pylint: disable=no-else-return,too-many-return-statements
 def sort_words(row1: WordRow, row2: WordRow) -> int:
     """
     Sort words in the list box based on the selected method and type
@@ -24,6 +155,11 @@ def sort_words(row1: WordRow, row2: WordRow) -> int:
     int
         -1 if row1 < row2, 1 if row1 > row2, 0 if they are equal
     """
+    # Search results go best match first, whatever the sort method is
+    order = compare_matches(row1, row2, shared.win.search_query)
+    if order:
+        return order
+
     sortable1: str | int
     sortable2: str | int
 
@@ -61,9 +197,36 @@ def sort_words(row1: WordRow, row2: WordRow) -> int:
             return 0
 
 
+def fits_types(mask: int, enabled_mask: int, mode: str) -> bool:
+    """
+    Check a word type bitmask against the bitmask of the enabled types
+
+    Parameters
+    ----------
+    mask : int
+        Bitmask of the word types
+    enabled_mask : int
+        Bitmask of the enabled types, no types means no filtering
+    mode : str
+        `all` to require all enabled types, `any` to require any of them and `none`
+        to require none of them
+
+    Returns
+    -------
+    bool
+        True if the word fits the filter, False otherwise
+    """
+    if mode == "any":
+        return not enabled_mask or bool(mask & enabled_mask)
+    elif mode == "none":
+        return not mask & enabled_mask
+    else:
+        return mask & enabled_mask == enabled_mask
+
+
 def filter_words(row: WordRow) -> bool:
     """
-    Filter words in the list box based on the search entry text and strict type filters
+    Filter words in the list box based on the search entry text and type filters
 
     Parameters
     ----------
@@ -75,18 +238,33 @@ def filter_words(row: WordRow) -> bool:
     bool
         True if the word matches both the text and type filters, False otherwise
     """
-    text: str = shared.win.lexicon_search_entry.get_text().lower()
-    fits_in_filter = set(shared.config["enabled-types"]).issubset(set(row.word.types))
-    if not text.startswith("#"):
+    query: SearchQuery = shared.win.search_query
+    fits_in_filter = fits_types(
+        row.word.types_mask,
+        shared.win.enabled_types_mask,
+        shared.win.type_filter_mode,
+    )
+    if query.mode in ("fuzzy", "fulltext"):
+        results = (
+            fuzzy_distances(row.word.parent_lexicon, query)
+            if query.mode == "fuzzy"
+            else fulltext_ranks(row.word.parent_lexicon, query)
+        )
+        matches_text = results is None or row.word.id in results
+        logger.debug(
+            "Word “%s”, is shown: %s",
+            row.word.word,
+            matches_text and fits_in_filter,
+        )
+        return matches_text and fits_in_filter
+    elif query.mode == "text":
         try:
+            # The query is answered by the trigram index once and reused for the
+            # other rows
             matches_text = (
-                text == ""
-                or text in row.word.word.lower().replace("&rtl", "")
-                or (
-                    text in row.word.translations[0].lower().replace("&rtl", "")
-                    if row.word.translations
-                    else ""
-                )
+                query.text == ""
+                or row.word.id
+                in row.word.parent_lexicon.indexes.words_matching(query.text)
             )
             logger.debug(
                 "Word “%s”, is shown: %s",
@@ -99,15 +277,14 @@ def filter_words(row: WordRow) -> bool:
             logger.debug("An error occurred while filtering word, showing")
             return True
     else:
-        text = text.replace(" ", "")
-        tags = set(text.split("#")[1:])
-        word_tags = set(row.word.tags)
+        # The query is answered by the tag index once and reused for the other rows
+        tagged = row.word.parent_lexicon.indexes.words_with_tags(query.tags)
         logger.debug(
             "Word “%s”, is shown: %s",
             row.word.word,
-            tags.issubset(word_tags) and fits_in_filter,
+            row.word.id in tagged and fits_in_filter,
         )
-        return tags.issubset(word_tags) and fits_in_filter
+        return row.word.id in tagged and fits_in_filter
 
 
 def filter_lexicons(row: Gtk.ListBoxRow) -> bool:
@@ -0,0 +1,655 @@
+"""Storage engines keeping Lexicons on the disk"""
+
+import marshal
+import os
+import shutil
+import time
+import uuid
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
+from pathlib import Path
+from typing import Union
+
+from gi.repository import GLib
+
+from lexi import enums, shared
+from lexi.logging.logger import logger
+from lexi.utils import (
+    durable,
+    journal,
+    parallel,
+    parse_cache,
+    serialization,
+    shards,
+)
+from lexi.utils.database import Database
+
+# Header key with the id for the next new word, so ids of removed words aren't reused
+NEXT_ID_KEY = "next-id"
+
+
+class LexiconStorage:
+    """Base class for Lexicon storage engines
+
+    Parameters
+    ----------
+    path : Path
+        Path of the file the Lexicon is stored in
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        # Number of stored words as of the last load or commit, None if unknown
+        self.word_count: int = None
+
+    def load(self) -> dict:
+        """Load the Lexicon data
+
+        Returns
+        -------
+        dict
+            Lexicon data in the same format as it's stored in the YAML Lexicon files
+        """
+        raise NotImplementedError
+
+    def load_header(self) -> dict:
+        """Load the Lexicon header, possibly without the words
+
+        Engines which can't read the header alone return the whole Lexicon data
+
+        Returns
+        -------
+        dict
+            Lexicon `id` and `name`, and `words` if they were loaded too
+        """
+        return self.load()
+
+    def commit(self, lexicon, changes: dict[int, Union[object, None]]) -> None:
+        """Write changes made to the Lexicon
+
+        Parameters
+        ----------
+        lexicon : Lexicon
+            Lexicon to write the changes of
+        changes : dict[int, Word | None]
+            Words changed since the last commit by their ids, `None` for removed words
+        """
+        raise NotImplementedError
+
+    def set_name(self, lexicon, name: str) -> None:
+        """Write a new name of the Lexicon
+
+        Parameters
+        ----------
+        lexicon : Lexicon
+            Renamed Lexicon
+        name : str
+            New name of the Lexicon
+        """
+        raise NotImplementedError
+
+    def compact(self, lexicon) -> None:
+        """Bring the stored Lexicon to its most compact form
+
+        Parameters
+        ----------
+        lexicon : Lexicon
+            Lexicon to compact
+        """
+
+    def discard(self) -> None:
+        """Drop the pending writes of the Lexicon, keeping the stored Lexicon as is"""
+
+    def remove(self) -> None:
+        """Remove the stored Lexicon"""
+        raise NotImplementedError
+
+    @property
+    def needs_compaction(self) -> bool:
+        """Whether `compact()` should be called"""
+        return False
+
+
+# pylint: disable=too-many-instance-attributes
+class FileStorage(LexiconStorage):
+    """Stores a Lexicon as sharded YAML files, optionally with a change journal
+
+    The words are split into shards by their ids, see `lexi.utils.shards`, so a
+    snapshot rewrites only the shards with changed words, and the manifest if the
+    header or the set of shards changed. With the `journal` storage backend only
+    changes are appended to the journal, which is folded into the snapshot once it
+    grows large enough. Parsed files are kept in the parse cache, so unchanged files
+    aren't parsed again. Snapshots are serialized and written by the background
+    writer
+
+    Parameters
+    ----------
+    path : Path
+        Path of the YAML Lexicon file
+    snapshot : dict, optional
+        Already parsed content of the YAML Lexicon file, returned by the first load
+    """
+
+    def __init__(self, path: Path, snapshot: dict = None) -> None:
+        super().__init__(path)
+        self.journal = journal.Journal(journal.journal_path(path))
+        self._snapshot = snapshot
+        self._compaction_source_id: int = None
+        # Whether a snapshot write is dropping a rotated journal
+        self._compacting: bool = False
+        self._compact_again: bool = False
+        # Shard size of the Lexicon, known once the words are loaded
+        self._shard_size: int = None
+        # Last written manifest, None if the words are stored inline
+        self._manifest: dict = None
+        # Shards changed since the last snapshot
+        self._dirty: set[int] = set()
+        # Shards submitted to the writer by the number of the submitting compaction,
+        # kept until written, since a pending write can be replaced by a newer one
+        self._unsaved: dict[int, int] = {}
+        self._compactions: int = 0
+        # Next word id as stored, once the words are loaded
+        self._next_id: int = None
+
+    @classmethod
+    def create(cls, path: Path, lexicon_id: str, name: str) -> "FileStorage":
+        """Create a file for a new empty Lexicon
+
+        Parameters
+        ----------
+        path : Path
+            Path of the Lexicon file
+        lexicon_id : str
+            ID of the Lexicon
+        name : str
+            Name of the Lexicon
+
+        Returns
+        -------
+        FileStorage
+            Storage of the new Lexicon
+        """
+        write_sharded(path, {"id": lexicon_id, "name": name, "words": []})
+        durable.after_commit(
+            partial(shared.lexictrl.index.update, path, lexicon_id, name, 0)
+        )
+        return cls(path)
+
+    def load(self) -> dict:
+        data, self._snapshot = self._snapshot, None
+        if data is None:
+            data = _read(self.path)
+        if shards.is_manifest(data):
+            self._shard_size = data[shards.SHARD_SIZE_KEY]
+            indexes = data[shards.SHARDS_KEY]
+            word_count = data.get(shards.WORD_COUNT_KEY)
+            data = shards.header(data)
+            self._manifest = shards.manifest(
+                data, word_count, self._shard_size, indexes
+            )
+            data["words"] = self.__load_shards(indexes)
+        else:
+            logger.debug("“%s” keeps the words inline, sharding on save", self.path)
+            self._shard_size = shards.SHARD_SIZE
+        self.journal.replay(data)
+        # Set by the header records of the journal
+        data.pop(shards.WORD_COUNT_KEY, None)
+        self.word_count = len(data["words"])
+        self._next_id = data.get(NEXT_ID_KEY)
+        self._dirty.update(
+            shards.shard_index(id_, self._shard_size)
+            for id_ in self.journal.changed_ids
+        )
+        return data
+
+    def load_header(self) -> dict:
+        header = self._snapshot
+        if header is None:
+            header = parse_cache.load_header(self.path, os.stat(self.path))
+        if header is None:
+            # Manifests are small, and the words of other files have to be counted
+            header = self._snapshot = _read(self.path)
+        if shards.WORD_COUNT_KEY not in header:
+            # The words are stored inline or weren't counted, nothing to spare
+            return self.load()
+        header = dict(header)
+        self.journal.replay_header(header)
+        self.word_count = header[shards.WORD_COUNT_KEY]
+        return shards.header(header)
+
+    def commit(self, lexicon, changes: dict[int, Union[object, None]]) -> None:
+        self._dirty.update(shards.shard_index(id_, self._shard_size) for id_ in changes)
+        if enums.Schema.STORAGE_BACKEND() != enums.StorageBackend.JOURNAL:
+            self.compact(lexicon)
+            return
+
+        self.journal.append(self.__journal_records(lexicon, changes))
+        self.__update_index(lexicon)
+        if self.needs_compaction and self._compaction_source_id is None:
+            self._compaction_source_id = GLib.idle_add(
+                self.__on_compaction_idle, lexicon, priority=GLib.PRIORITY_LOW
+            )
+
+    def set_name(self, lexicon, name: str) -> None:
+        if enums.Schema.STORAGE_BACKEND() == enums.StorageBackend.JOURNAL:
+            self.journal.append([journal.set_record("name", name)])
+            self.__update_index(lexicon)
+        else:
+            self.compact(lexicon)
+
+    def compact(self, lexicon) -> None:
+        """Write the changed shards and the manifest and drop the journal
+
+        The words of the changed shards are copied immediately and serialized and
+        written in the background. The journal is rotated, so the records appended
+        meanwhile are kept, and the rotated journal is removed once the snapshot is
+        written. If the words of a sharded Lexicon aren't loaded, only the manifest
+        is written
+
+        Parameters
+        ----------
+        lexicon : Lexicon
+            Lexicon to write
+        """
+        if self._compacting:
+            # Only the running write may drop the rotated journal, wait for it
+            self._compact_again = True
+            return
+
+        # pylint: disable=protected-access
+        header = shards.header(lexicon._data)
+        if not lexicon.loaded and self.__read_manifest():
+            # Nothing but the header could change, keep the shards. The header of an
+            # unloaded Lexicon may lack the keys it doesn't need
+            header = {**shards.header(self._manifest), **header}
+            split = {}
+            indexes = self._manifest[shards.SHARDS_KEY]
+        else:
+            # Loads the words first, which sets the shard size
+            words = lexicon.words
+            split = shards.split((word._word for word in words), self._shard_size)
+            indexes = split
+        self.word_count = lexicon.word_count
+        manifest = shards.manifest(header, self.word_count, self._shard_size, indexes)
+        written = self._manifest[shards.SHARDS_KEY] if self._manifest else ()
+        # Shards missing in the written manifest are new and always written
+        dirty = self._dirty | self._unsaved.keys() | (split.keys() - set(written))
+        self._dirty = set()
+        self._compactions += 1
+        self._unsaved.update(dict.fromkeys(dirty, self._compactions))
+        payloads = {
+            index: marshal.dumps(split[index]) for index in dirty if index in split
+        }
+
+        records = self.journal.records
+        rotated = self.journal.rotate()
+        self._compacting = rotated is not None
+        shared.lexictrl.writer.submit(
+            str(self.path),
+            partial(
+                _write_shards,
+                self.path,
+                manifest if manifest != self._manifest else None,
+                payloads,
+                rotated,
+            ),
+            partial(
+                self.__on_compacted,
+                lexicon,
+                self._compactions,
+                manifest,
+                records if rotated else 0,
+            ),
+        )
+
+    def discard(self) -> None:
+        if self._compaction_source_id is not None:
+            GLib.source_remove(self._compaction_source_id)
+            self._compaction_source_id = None
+        shared.lexictrl.writer.discard(str(self.path))
+
+    def remove(self) -> None:
+        self.discard()
+        os.remove(self.path)
+        self.journal.remove()
+        parse_cache.evict(self.path)
+        shared.lexictrl.index.remove(self.path)
+        _remove_stale_shards(self.path, ())
+        try:
+            shards.shards_dir(self.path).rmdir()
+        except FileNotFoundError:
+            pass
+
+    @property
+    def needs_compaction(self) -> bool:
+        return self.journal.needs_compaction
+
+    def __on_compaction_idle(self, lexicon) -> bool:
+        self._compaction_source_id = None
+        if self.needs_compaction:
+            self.compact(lexicon)
+        return GLib.SOURCE_REMOVE
+
+    def __read_manifest(self) -> bool:
+        """Read the manifest without the words, return whether the Lexicon is sharded"""
+        if self._manifest is None:
+            data = _read(self.path)
+            if not shards.is_manifest(data):
+                return False
+            self._shard_size = data[shards.SHARD_SIZE_KEY]
+            self._manifest = shards.manifest(
+                shards.header(data),
+                data.get(shards.WORD_COUNT_KEY),
+                self._shard_size,
+                data[shards.SHARDS_KEY],
+            )
+        return True
+
+    def __journal_records(
+        self, lexicon, changes: dict[int, Union[object, None]]
+    ) -> list[dict]:
+        """Return the records of the changed words and of the changed counters"""
+        # pylint: disable=protected-access
+        records = [
+            journal.rm_record(id_) if word is None else journal.put_record(word._word)
+            for id_, word in changes.items()
+        ]
+        if lexicon._data.get(NEXT_ID_KEY) != self._next_id:
+            self._next_id = lexicon._data[NEXT_ID_KEY]
+            records.append(journal.set_record(NEXT_ID_KEY, self._next_id))
+        if lexicon.word_count != self.word_count:
+            self.word_count = lexicon.word_count
+            records.append(journal.set_record(shards.WORD_COUNT_KEY, self.word_count))
+        return records
+
+    def __update_index(self, lexicon) -> None:
+        shared.lexictrl.index.update(
+            self.path, lexicon.id, lexicon.name, lexicon.word_count
+        )
+
+    def __load_shards(self, indexes: list[int]) -> list[dict]:
+        paths = [shards.shard_path(self.path, index) for index in indexes]
+        snapshots = parse_stale(paths)
+        words = []
+        for path in paths:
+            data = snapshots[path] if path in snapshots else _read(path)
+            words.extend(data["words"])
+        return words
+
+    def __on_compacted(
+        self, lexicon, compaction: int, manifest: dict, records: int, success: bool
+    ) -> None:
+        self._compacting = False
+        if not success:
+            # Retry with the next save, the unsaved shards are written again and the
+            # rotated journal keeps the records
+            lexicon.save()
+        else:
+            self._manifest = manifest
+            self.__update_index(lexicon)
+            self._unsaved = {
+                index: submitted
+                for index, submitted in self._unsaved.items()
+                if submitted != compaction
+            }
+            if records:
+                logger.debug(
+                    "Compacted %d journal records into “%s”", records, lexicon.name
+                )
+        if self._compact_again:
+            self._compact_again = False
+            self.compact(lexicon)
+
+
+class SqliteStorage(LexiconStorage):
+    """Stores a Lexicon in the SQLite database, updating only the changed rows
+
+    Parameters
+    ----------
+    database : Database
+        Database with the Lexicon
+    lexicon_id : str
+        ID of the Lexicon
+    """
+
+    def __init__(self, database: Database, lexicon_id: str) -> None:
+        super().__init__(Path(database.path))
+        self.database = database
+        self.lexicon_id = lexicon_id
+
+    @classmethod
+    def create(cls, database: Database, lexicon_id: str, name: str) -> "SqliteStorage":
+        """Add a new empty Lexicon to the database
+
+        Parameters
+        ----------
+        database : Database
+            Database to add the Lexicon to
+        lexicon_id : str
+            ID of the Lexicon
+        name : str
+            Name of the Lexicon
+
+        Returns
+        -------
+        SqliteStorage
+            Storage of the new Lexicon
+        """
+        database.add_lexicon(lexicon_id, name)
+        return cls(database, lexicon_id)
+
+    def load(self) -> dict:
+        data = self.database.get_lexicon(self.lexicon_id)
+        data["words"] = self.database.load_words(self.lexicon_id)
+        return data
+
+    def commit(self, lexicon, changes: dict[int, Union[object, None]]) -> None:
+        # pylint: disable=protected-access
+        with self.database.transaction():
+            self.database.rm_words(
+                self.lexicon_id, (id_ for id_, word in changes.items() if word is None)
+            )
+            self.database.put_words(
+                self.lexicon_id,
+                (word._word for word in changes.values() if word is not None),
+            )
+            if NEXT_ID_KEY in lexicon._data:
+                self.database.set_next_id(self.lexicon_id, lexicon._data[NEXT_ID_KEY])
+
+    def load_header(self) -> dict:
+        return self.database.get_lexicon(self.lexicon_id)
+
+    def set_name(self, lexicon, name: str) -> None:
+        self.database.rename_lexicon(self.lexicon_id, name)
+
+    def remove(self) -> None:
+        self.database.rm_lexicon(self.lexicon_id)
+
+
+def create(name: str) -> LexiconStorage:
+    """Create the storage of a new empty Lexicon in the current storage backend
+
+    Parameters
+    ----------
+    name : str
+        Name of the Lexicon
+
+    Returns
+    -------
+    LexiconStorage
+        Storage of the new Lexicon with a new unique id
+    """
+    if enums.Schema.STORAGE_BACKEND() == enums.StorageBackend.SQLITE:
+        database = shared.lexictrl.database
+        while True:
+            lexicon_id = str(uuid.uuid4().hex)
+            if database.get_lexicon(lexicon_id) is None:
+                break
+        return SqliteStorage.create(database, lexicon_id, name)
+
+    while True:
+        lexicon_id = str(uuid.uuid4().hex)
+        lexicon_path = os.path.join(shared.data_dir, "lexicons", lexicon_id + ".yaml")
+        if not os.path.exists(lexicon_path):
+            break
+    return FileStorage.create(Path(lexicon_path), lexicon_id, name)
+
+
+def write_sharded(path: Path, data: dict) -> None:
+    """Write a whole Lexicon as a sharded Lexicon file
+
+    Parameters
+    ----------
+    path : Path
+        Path of the Lexicon file
+    data : dict
+        Lexicon data in the same format as it's stored in the YAML Lexicon files
+    """
+    split = shards.split(data["words"], shards.SHARD_SIZE)
+    _write_shards(
+        path,
+        shards.manifest(
+            shards.header(data), len(data["words"]), shards.SHARD_SIZE, split
+        ),
+        {index: marshal.dumps(words) for index, words in split.items()},
+        None,
+    )
+
+
+def parse_stale(paths: list[Path]) -> dict[Path, dict]:
+    """Parse the files missing in the parse cache in worker processes
+
+    Does nothing unless `load-workers` allows more than one worker and more than
+    one file has to be parsed
+
+    Parameters
+    ----------
+    paths : list[Path]
+        Paths of the Lexicon or shard files
+
+    Returns
+    -------
+    dict[Path, dict]
+        Parsed data of the files by their paths
+    """
+    workers = enums.Schema.LOAD_WORKERS()
+    if workers == 1:
+        return {}
+    stale = [path for path in paths if not parse_cache.is_valid(path, os.stat(path))]
+    if parallel.workers_count(workers, len(stale)) == 1:
+        return {}
+
+    start = time.perf_counter()
+    try:
+        snapshots = parallel.parse_files(stale, workers)
+    except (OSError, BrokenProcessPool, serialization.YAMLError) as e:
+        logger.warning("Parallel loading failed, loading sequentially: %s", e)
+        return {}
+    for path, data in snapshots.items():
+        parse_cache.store(path, data)
+    logger.info(
+        "Parsed %d files with %d workers in %.2f ms",
+        len(snapshots),
+        parallel.workers_count(workers, len(stale)),
+        (time.perf_counter() - start) * 1000,
+    )
+    return snapshots
+
+
+def _read(path: Path) -> dict:
+    data = parse_cache.load(path, os.stat(path))
+    if data is None:
+        with open(path, "r", encoding="utf-8") as file:
+            data = serialization.load_streamed(file, "words")
+        parse_cache.store(path, data)
+    return data
+
+
+def _write_shards(
+    path: Path,
+    manifest: Union[dict, None],
+    payloads: dict[int, bytes],
+    rotated: Union[Path, None],
+) -> None:
+    # Shards go first, so the manifest never lists a shard which isn't written
+    if payloads:
+        os.makedirs(shards.shards_dir(path), exist_ok=True)
+    for index, words in payloads.items():
+        shard = shards.shard_path(path, index)
+        durable.write(shard, serialization.dump({"words": marshal.loads(words)}))
+        parse_cache.store_marshalled(shard, {}, words)
+    if manifest is not None:
+        durable.write(path, serialization.dump(manifest))
+        parse_cache.store(path, manifest)
+        durable.after_commit(
+            partial(_remove_stale_shards, path, manifest[shards.SHARDS_KEY])
+        )
+    if rotated is not None:
+        durable.after_commit(partial(rotated.unlink, missing_ok=True))
+
+
+def _remove_stale_shards(path: Path, indexes: list[int]) -> None:
+    for file in shards.stale_shards(path, indexes):
+        logger.debug("Removing stale shard “%s”", file)
+        file.unlink(missing_ok=True)
+        parse_cache.evict(file)
+
+
+def convert_to_sqlite(database: Database, directory: str) -> None:
+    """Import all YAML Lexicons from `directory` into the database
+
+    The conversion happens once, in a single transaction. The YAML files are left
+    untouched
+
+    Parameters
+    ----------
+    database : Database
+        Database to import the Lexicons into
+    directory : str
+        Directory with the YAML Lexicon files
+    """
+    if database.get_meta("converted-from-yaml"):
+        return
+
+    logger.info("Converting YAML Lexicons to the SQLite database")
+    with database.transaction():
+        for file in sorted(Path(directory).glob("*.yaml")):
+            data = FileStorage(file).load()
+            if database.get_lexicon(data["id"]) is None:
+                database.add_lexicon(data["id"], data["name"])
+            database.put_words(data["id"], data["words"])
+            if NEXT_ID_KEY in data:
+                database.set_next_id(data["id"], data[NEXT_ID_KEY])
+            logger.info("Lexicon “%s” converted to SQLite", data["name"])
+        database.set_meta("converted-from-yaml", 1)
+
+
+def convert_to_yaml(database: Database, directory: str) -> None:
+    """Write all Lexicons from the database to YAML files in `directory`
+
+    YAML Lexicons and journals which are not in the database are removed, so the
+    directory mirrors the database afterwards
+
+    Parameters
+    ----------
+    database : Database
+        Database to export the Lexicons from
+    directory : str
+        Directory for the YAML Lexicon files
+    """
+    logger.info("Converting the SQLite database to YAML Lexicons")
+    kept = set()
+    with durable.batch():
+        for header in database.lexicons():
+            data = dict(header, words=database.load_words(header["id"]))
+            path = Path(directory, header["id"] + ".yaml")
+            write_sharded(path, data)
+            kept.add(path.stem)
+            logger.info("Lexicon “%s” converted to YAML", header["name"])
+    for file in list(Path(directory).iterdir()):
+        if file.suffix == shards.SHARDS_SUFFIX and file.stem not in kept:
+            shutil.rmtree(file)
+        elif file.suffix == ".journal" or (
+            file.suffix == ".yaml" and file.stem not in kept
+        ):
+            os.remove(file)
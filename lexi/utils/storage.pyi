@@ -0,0 +1,49 @@
+# pylint: disable=all
+from pathlib import Path
+from typing import Union
+
+from lexi.utils.backend import Lexicon, Word
+from lexi.utils.database import Database
+from lexi.utils.journal import Journal
+
+NEXT_ID_KEY: str
+
+class LexiconStorage:
+    path: Path
+    word_count: Union[int, None]
+
+    def __init__(self, path: Path) -> None: ...
+    def load(self) -> dict: ...
+    def load_header(self) -> dict: ...
+    def commit(
+        self, lexicon: Lexicon, changes: dict[int, Union[Word, None]]
+    ) -> None: ...
+    def set_name(self, lexicon: Lexicon, name: str) -> None: ...
+    def compact(self, lexicon: Lexicon) -> None: ...
+    def discard(self) -> None: ...
+    def remove(self) -> None: ...
+    @property
+    def needs_compaction(self) -> bool: ...
+
+class FileStorage(LexiconStorage):
+    journal: Journal
+
+    def __init__(self, path: Path, snapshot: dict = None) -> None: ...
+    @classmethod
+    def create(cls, path: Path, lexicon_id: str, name: str) -> FileStorage: ...
+
+class SqliteStorage(LexiconStorage):
+    database: Database
+    lexicon_id: str
+
+    def __init__(self, database: Database, lexicon_id: str) -> None: ...
+    @classmethod
+    def create(
+        cls, database: Database, lexicon_id: str, name: str
+    ) -> SqliteStorage: ...
+
+def create(name: str) -> LexiconStorage: ...
+def write_sharded(path: Path, data: dict) -> None: ...
+def parse_stale(paths: list[Path]) -> dict[Path, dict]: ...
+def convert_to_sqlite(database: Database, directory: str) -> None: ...
+def convert_to_yaml(database: Database, directory: str) -> None: ...
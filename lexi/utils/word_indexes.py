@@ -0,0 +1,294 @@
+"""Indexes of the loaded words of a Lexicon, for searches and reference counts"""
+
+from typing import Iterable
+
+from lexi.utils import search
+
+# Bit positions of the word types in the type masks, assigned on the first use
+_type_bits: dict[str, int] = {}
+
+
+def types_mask(types: Iterable[str]) -> int:
+    """Return the bitmask of the word types
+
+    Parameters
+    ----------
+    types : Iterable[str]
+        Word types
+
+    Returns
+    -------
+    int
+        Bitmask with the bits of the types set, masks of the same types are equal
+        during the whole session
+    """
+    mask = 0
+    for type_ in types:
+        mask |= 1 << _type_bits.setdefault(type_, len(_type_bits))
+    return mask
+
+
+# pylint: disable=too-many-instance-attributes
+class WordIndexes:
+    """Incoming references, tags and texts of the words of a Lexicon
+
+    Incoming references and tags of the words are indexed on creation, so reference
+    counts, dereferencing removed words and tag searches don't scan the lexicon.
+    Words and their first translations are indexed by trigrams for text searches,
+    by edit distances for fuzzy searches and in sorted order for their completion,
+    and all texts of the words by their tokens for ranked full-text searches, once
+    the lexicon is searched that way. The result of the last query of every kind is
+    kept until the words it depends on change
+
+    Parameters
+    ----------
+    words_by_id : dict[int, Word]
+        Words of the lexicon by their ids, kept up to date by the lexicon
+    """
+
+    def __init__(self, words_by_id: dict) -> None:
+        self._words_by_id = words_by_id
+        # IDs of the words referring to a word by the referenced word id
+        self._referrers: dict[int, set[int]] = {}
+        # IDs of the words with a tag by the tag
+        self._tagged: dict[str, set[int]] = {}
+        # Last tag query with its result
+        self._tag_query: tuple[frozenset[str], frozenset[int]] = None
+        # Built on the first text search
+        self._trigrams: search.TrigramIndex = None
+        # Last text query with its result
+        self._text_query: tuple[str, frozenset[int]] = None
+        # Built on the first fuzzy search
+        self._bktree: search.BKTree = None
+        # Last fuzzy query and distance with its result
+        self._fuzzy_query: tuple[str, int, dict[int, int]] = None
+        # Built on the first completion
+        self._prefixes: search.PrefixIndex = None
+        # Built on the first full-text search
+        self._fulltext: search.FullTextIndex = None
+        # Last full-text query with its result
+        self._fulltext_query: tuple[str, dict[int, tuple[int, float]]] = None
+        for word in words_by_id.values():
+            for reference in word.references:
+                self._referrers.setdefault(reference, set()).add(word.id)
+            for tag in word.tags:
+                self._tagged.setdefault(tag, set()).add(word.id)
+
+    def add(self, word) -> None:
+        """Index a word added to the lexicon"""
+        for reference in word.references:
+            self.add_referrer(reference, word.id)
+        for tag in word.tags:
+            self.add_tagged(tag, word.id)
+        self.reindex_text(word)
+
+    def remove(self, word) -> None:
+        """Forget a word removed from the lexicon, except the references to it"""
+        for reference in word.references:
+            self.rm_referrer(reference, word.id)
+        for tag in word.tags:
+            self.rm_tagged(tag, word.id)
+        for index in (self._trigrams, self._bktree, self._prefixes, self._fulltext):
+            if index is not None:
+                index.remove(word.id)
+        self._text_query = None
+        self._fuzzy_query = None
+        self._fulltext_query = None
+
+    def referrers(self, word_id: int) -> list[int]:
+        """Return the ids of the words referring to the word with the given id"""
+        return list(self._referrers.get(word_id, ()))
+
+    def ref_count(self, word_id: int) -> int:
+        """Return the number of words referring to the word with the given id
+
+        Parameters
+        ----------
+        word_id : int
+            ID of the referenced word
+
+        Returns
+        -------
+        int
+            Number of the referring words
+        """
+        return len(self._referrers.get(word_id, ()))
+
+    def add_referrer(self, word_id: int, referrer_id: int) -> None:
+        """Record a reference to the word `word_id` from the word `referrer_id`"""
+        self._referrers.setdefault(word_id, set()).add(referrer_id)
+
+    def rm_referrer(self, word_id: int, referrer_id: int) -> None:
+        """Forget a reference to the word `word_id` from the word `referrer_id`"""
+        referrers = self._referrers.get(word_id)
+        if referrers is not None:
+            referrers.discard(referrer_id)
+            if not referrers:
+                del self._referrers[word_id]
+
+    def add_tagged(self, tag: str, word_id: int) -> None:
+        """Record the tag of the word `word_id`"""
+        self._tagged.setdefault(tag, set()).add(word_id)
+        self._tag_query = None
+
+    def rm_tagged(self, tag: str, word_id: int) -> None:
+        """Forget the tag of the word `word_id`"""
+        tagged = self._tagged.get(tag)
+        if tagged is not None:
+            tagged.discard(word_id)
+            if not tagged:
+                del self._tagged[tag]
+        self._tag_query = None
+
+    def reindex_text(self, word) -> None:
+        """Update the texts of the word in the text search indexes"""
+        if self._words_by_id.get(word.id) is not word:
+            return
+        self._text_query = None
+        self._fuzzy_query = None
+        self._fulltext_query = None
+        if self._trigrams is not None:
+            self._trigrams.add(word.id, word.search_texts)
+        if self._bktree is not None:
+            self._bktree.add(word.id, word.search_texts[0])
+        if self._prefixes is not None:
+            self._prefixes.add(word.id, word.search_texts[0])
+        if self._fulltext is not None:
+            self._fulltext.add(word.id, word.fulltext_texts)
+
+    def words_with_tags(self, tags: Iterable[str]) -> frozenset[int]:
+        """Return the ids of the words having all the given tags
+
+        Parameters
+        ----------
+        tags : Iterable[str]
+            Tags to look for
+
+        Returns
+        -------
+        frozenset[int]
+            IDs of the words with all the tags, all ids if `tags` is empty
+        """
+        tags = frozenset(tags)
+        if self._tag_query is not None and self._tag_query[0] == tags:
+            return self._tag_query[1]
+        if not tags:
+            ids = frozenset(self._words_by_id)
+        else:
+            # Intersecting from the rarest tag keeps the intermediate sets small
+            sets = sorted((self._tagged.get(tag, set()) for tag in tags), key=len)
+            ids = frozenset(sets[0].intersection(*sets[1:]))
+        self._tag_query = (tags, ids)
+        return ids
+
+    def words_matching(self, text: str) -> frozenset[int]:
+        """Return the ids of the words with the text in the word or first translation
+
+        Parameters
+        ----------
+        text : str
+            Text to look for, compared case insensitively
+
+        Returns
+        -------
+        frozenset[int]
+            IDs of the matching words
+        """
+        text = search.normalize(text)
+        if self._text_query is not None and self._text_query[0] == text:
+            return self._text_query[1]
+        if self._trigrams is None:
+            self._trigrams = search.TrigramIndex(
+                (word.id, word.search_texts) for word in self._words_by_id.values()
+            )
+        ids = frozenset(self._trigrams.search(text))
+        self._text_query = (text, ids)
+        return ids
+
+    def words_near(self, text: str, distance: int) -> dict[int, int]:
+        """Return the words within the edit distance of the text
+
+        The result must not be modified
+
+        Parameters
+        ----------
+        text : str
+            Text to look for, compared case insensitively
+        distance : int
+            Maximum edit distance between the text and the words
+
+        Returns
+        -------
+        dict[int, int]
+            Edit distances of the matching words by their ids
+        """
+        text = search.normalize(text)
+        if self._fuzzy_query is not None and self._fuzzy_query[:2] == (text, distance):
+            return self._fuzzy_query[2]
+        if self._bktree is None:
+            self._bktree = search.BKTree()
+            for word in self._words_by_id.values():
+                self._bktree.add(word.id, word.search_texts[0])
+        found = self._bktree.search(text, distance)
+        self._fuzzy_query = (text, distance, found)
+        return found
+
+    def rank_words(self, text: str) -> dict[int, tuple[int, float]]:
+        """Return the words with any of the words of the text in any of their texts
+
+        The word itself, all translations and all examples are searched. The result
+        must not be modified
+
+        Parameters
+        ----------
+        text : str
+            Text to look for, compared case insensitively by its words
+
+        Returns
+        -------
+        dict[int, tuple[int, float]]
+            Ranks of the found words by their ids: numbers of the matched words of
+            the text and BM25 scores, higher ranks are better matches
+        """
+        if self._fulltext_query is not None and self._fulltext_query[0] == text:
+            return self._fulltext_query[1]
+        if self._fulltext is None:
+            self._fulltext = search.FullTextIndex()
+            for word in self._words_by_id.values():
+                self._fulltext.add(word.id, word.fulltext_texts)
+        ranks = self._fulltext.search(text)
+        self._fulltext_query = (text, ranks)
+        return ranks
+
+    def complete_word(self, prefix: str, limit: int) -> list:
+        """Return the words starting with the prefix, for completing new words
+
+        Parameters
+        ----------
+        prefix : str
+            Start of the word, compared case insensitively
+        limit : int
+            Maximum number of the returned words
+
+        Returns
+        -------
+        list[Word]
+            Words in the order of their normalized headwords
+        """
+        return [
+            self._words_by_id[word_id]
+            for word_id in self.__prefix_index().complete(
+                search.normalize(prefix), limit
+            )
+        ]
+
+    def has_word(self, word: str) -> bool:
+        """Return whether the lexicon has the word, compared case insensitively"""
+        return self.__prefix_index().contains(search.normalize(word))
+
+    def __prefix_index(self) -> search.PrefixIndex:
+        if self._prefixes is None:
+            self._prefixes = search.PrefixIndex(
+                (word.id, word.search_texts[0]) for word in self._words_by_id.values()
+            )
+        return self._prefixes
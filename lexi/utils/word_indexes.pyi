@@ -0,0 +1,24 @@
+# pylint: disable=all
+from typing import Iterable
+
+from lexi.utils.backend import Word
+
+def types_mask(types: Iterable[str]) -> int: ...
+
+class WordIndexes:
+    def __init__(self, words_by_id: dict[int, Word]) -> None: ...
+    def add(self, word: Word) -> None: ...
+    def remove(self, word: Word) -> None: ...
+    def referrers(self, word_id: int) -> list[int]: ...
+    def ref_count(self, word_id: int) -> int: ...
+    def add_referrer(self, word_id: int, referrer_id: int) -> None: ...
+    def rm_referrer(self, word_id: int, referrer_id: int) -> None: ...
+    def add_tagged(self, tag: str, word_id: int) -> None: ...
+    def rm_tagged(self, tag: str, word_id: int) -> None: ...
+    def reindex_text(self, word: Word) -> None: ...
+    def words_with_tags(self, tags: Iterable[str]) -> frozenset[int]: ...
+    def words_matching(self, text: str) -> frozenset[int]: ...
+    def words_near(self, text: str, distance: int) -> dict[int, int]: ...
+    def rank_words(self, text: str) -> dict[int, tuple[int, float]]: ...
+    def complete_word(self, prefix: str, limit: int) -> list[Word]: ...
+    def has_word(self, word: str) -> bool: ...
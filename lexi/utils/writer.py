@@ -0,0 +1,155 @@
+"""Background thread writing Lexicon snapshots off the GTK main loop"""
+
+import threading
+from typing import Callable, NamedTuple, Union
+
+from gi.repository import GLib
+
+from lexi import enums
+from lexi.logging.logger import logger
+from lexi.utils import durable
+
+
+class Job(NamedTuple):
+    """A pending background write
+
+    ::
+
+        run : Callable[[], None] -> does the write, called in the writer thread
+        done : Callable[[bool], None] | None -> called in the main loop with the result
+    """
+
+    run: Callable[[], None]
+    done: Union[Callable[[bool], None], None]
+
+
+class Writer:
+    """Runs write jobs in a dedicated thread, one job per key at a time
+
+    A job submitted for a key which already has a pending job replaces it, so only
+    the latest snapshot of a file gets written. Jobs queued together are written in
+    a single durable batch. Results are reported in the main loop, or by `drain()`
+    """
+
+    def __init__(self) -> None:
+        self._jobs: dict[str, Job] = {}
+        self._running: set[str] = set()
+        # Results of the written jobs not reported yet
+        self._done: list[tuple[str, Callable[[bool], None], bool]] = []
+        self._policy: enums.FsyncPolicy = None
+        self._cond = threading.Condition()
+        self._thread = threading.Thread(
+            target=self.__run, name="lexi-writer", daemon=True
+        )
+        self._thread.start()
+
+    def submit(
+        self,
+        key: str,
+        run: Callable[[], None],
+        done: Union[Callable[[bool], None], None] = None,
+    ) -> None:
+        """Queue a write job, replacing the pending job with the same key
+
+        Must be called from the main thread
+
+        Parameters
+        ----------
+        key : str
+            Key of the job, usually the path of the written file
+        run : Callable[[], None]
+            Function doing the write. It's called in the writer thread, so it must only
+            use data owned by the job
+        done : Callable[[bool], None], optional
+            Function called in the main loop after the job, with `True` if it
+            succeeded. Not called for replaced and discarded jobs
+        """
+        with self._cond:
+            if key in self._jobs:
+                logger.debug("Superseding the pending write of “%s”", key)
+                del self._jobs[key]
+            self._jobs[key] = Job(run, done)
+            # The settings are read on the main thread only
+            self._policy = enums.Schema.FSYNC_POLICY()
+            self._cond.notify_all()
+
+    def discard(self, key: str) -> None:
+        """Drop the pending job with the given key and wait for the running one
+
+        The result of the job with the key isn't reported then
+
+        Parameters
+        ----------
+        key : str
+            Key of the job
+        """
+        with self._cond:
+            self._jobs.pop(key, None)
+            while key in self._running:
+                self._cond.wait()
+            self._done = [done for done in self._done if done[0] != key]
+
+    @property
+    def busy(self) -> bool:
+        """Whether any jobs are queued, running or have unreported results"""
+        with self._cond:
+            return bool(self._jobs or self._running or self._done)
+
+    def drain(self) -> None:
+        """Wait until all queued jobs are written and report their results
+
+        Must be called from the main thread. Jobs submitted by the `done` callbacks
+        are waited for too
+        """
+        while True:
+            with self._cond:
+                if self._jobs or self._running:
+                    logger.info(
+                        "Waiting for %d background writes",
+                        len(self._jobs) + len(self._running),
+                    )
+                while self._jobs or self._running:
+                    self._cond.wait()
+                if not self._done:
+                    return
+            self.__report()
+
+    def __run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._jobs:
+                    self._cond.wait()
+                jobs = self._jobs
+                self._jobs = {}
+                self._running = set(jobs)
+                policy = self._policy
+
+            results = dict.fromkeys(jobs, True)
+            try:
+                with durable.batch(policy):
+                    for key, job in jobs.items():
+                        try:
+                            job.run()
+                        except Exception as e:  # pylint: disable=broad-except
+                            logger.error("Failed to write “%s”: %s", key, e)
+                            results[key] = False
+            except OSError as e:
+                logger.error("Failed to commit background writes: %s", e)
+                results = dict.fromkeys(jobs, False)
+
+            with self._cond:
+                self._done.extend(
+                    (key, job.done, results[key])
+                    for key, job in jobs.items()
+                    if job.done is not None
+                )
+                self._running = set()
+                self._cond.notify_all()
+            GLib.idle_add(self.__report)
+
+    def __report(self) -> bool:
+        with self._cond:
+            done, self._done = self._done, []
+        for _key, callback, success in done:
+            callback(success)
+        return GLib.SOURCE_REMOVE
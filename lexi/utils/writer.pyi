@@ -0,0 +1,19 @@
+# pylint: disable=all
+from typing import Callable, NamedTuple, Union
+
+class Job(NamedTuple):
+    run: Callable[[], None]
+    done: Union[Callable[[bool], None], None]
+
+class Writer:
+    def __init__(self) -> None: ...
+    def submit(
+        self,
+        key: str,
+        run: Callable[[], None],
+        done: Union[Callable[[bool], None], None] = None,
+    ) -> None: ...
+    def discard(self, key: str) -> None: ...
+    @property
+    def busy(self) -> bool: ...
+    def drain(self) -> None: ...
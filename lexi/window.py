@@ -8,7 +8,14 @@ from lexi.ui.ReferenceRow import ReferenceRow
 from lexi.ui.TypeRow import TypeRow
 from lexi.ui.WordRow import WordRow
 from lexi.utils.backend import Lexicon, Word
-from lexi.utils.sort_filter import filter_lexicons, filter_words, sort_words
+from lexi.utils.sort_filter import (
+    SearchQuery,
+    filter_lexicons,
+    filter_words,
+    parse_query,
+    sort_words,
+)
+from lexi.utils.word_indexes import types_mask
 
 
 @Gtk.Template(resource_path=shared.PREFIX + "/gtk/window.ui")
@@ -86,10 +93,16 @@ class LexiWindow(Adw.ApplicationWindow):
 
     sort_method: str = shared.state_schema.get_string("sort-method")
     sort_type: str = shared.state_schema.get_string("sort-type")
+    type_filter_mode: str = shared.state_schema.get_string("type-filter-mode")
+    search_query: SearchQuery = SearchQuery("text")
+    # Bitmask of the types enabled in the filter, see `update_types_filter()`
+    enabled_types_mask: int = 0
 
     # Variables to store the currently loaded lexicon and word
     _loaded_lexicon: Lexicon = None
     _loaded_word: Word = None
+    # Whether the words are sorted by a fuzzy or full-text search query
+    _ranked_sorted: bool = False
     selected_words: list = []
 
     _state: enums.WindowState = None
@@ -109,6 +122,7 @@ class LexiWindow(Adw.ApplicationWindow):
 
         key_kapture_controller = Gtk.EventControllerKey()
         self.add_controller(key_kapture_controller)
+        self.enabled_types_mask = types_mask(shared.config["enabled-types"])
 
         # Connections
         self.lexicons_list_box.set_filter_func(filter_lexicons)
@@ -119,6 +133,9 @@ class LexiWindow(Adw.ApplicationWindow):
         self.connect("notify::loaded-lexicon", self.__on_lexicon_changed)
         self.connect("notify::loaded-word", self.__on_word_changed)
         self.connect("notify::state", self.__on_state_change)
+        shared.lexictrl.connect("lexicon-added", self.__on_lexicons_changed)
+        shared.lexictrl.connect("lexicon-removed", self.__on_lexicons_changed)
+        shared.lexictrl.connect("lexicon-reloaded", self.__on_lexicon_reloaded)
 
         # Extracts ListBoxes from expander rows
         for epxander_row in (
@@ -156,7 +173,7 @@ class LexiWindow(Adw.ApplicationWindow):
         self.lexicons_list_box.remove_all()
         # pylint: disable=protected-access
         if len(shared.lexictrl) != 0:
-            for lexicon in sorted(shared.lexictrl, key=lambda x: x.name):
+            for lexicon in shared.lexictrl:
                 lexicon_row = LexiconRow(lexicon=lexicon)
                 self.lexicons_list_box.append(lexicon_row)
             self.lexicons_scrolled_window.set_child(self.lexicons_list_box)
@@ -220,6 +237,27 @@ class LexiWindow(Adw.ApplicationWindow):
         self.lexicon_list_box.invalidate_sort()
         shared.state_schema.set_string("sort-type", self.sort_type)
 
+    def on_type_filter_mode_changed(
+        self, action: Gio.SimpleAction, state: GLib.Variant
+    ) -> None:
+        """
+        Handle changes to the word type filter mode
+
+        Parameters
+        ----------
+        action : Gio.SimpleAction
+            The action that triggered the change
+        state : GLib.Variant
+            The new state of the word type filter mode
+        """
+        action.set_state(state)
+        self.type_filter_mode = state.get_string()
+        logger.info(
+            "Type filter mode changed to “%s”, refiltering", self.type_filter_mode
+        )
+        self.lexicon_list_box.invalidate_filter()
+        shared.state_schema.set_string("type-filter-mode", self.type_filter_mode)
+
     @Gtk.Template.Callback()
     def on_toggle_sidebar_action(self, *_args) -> None:
         """Toggles the sidebar visibility"""
@@ -322,6 +360,43 @@ class LexiWindow(Adw.ApplicationWindow):
         else:
             self.set_property("state", enums.WindowState.EMPTY)
 
+    def __on_lexicons_changed(self, _controller, lexicon: Lexicon) -> None:
+        """Handle a Lexicon file added or removed by another program"""
+        if lexicon is self.loaded_lexicon and lexicon not in shared.lexictrl:
+            self.set_property("loaded-lexicon", None)
+        self.build_sidebar()
+
+    def __on_lexicon_reloaded(
+        self,
+        _controller,
+        lexicon: Lexicon,
+        added: list[Word],
+        changed: list[Word],
+        removed: list[Word],
+    ) -> None:
+        """Update the rows of the loaded Lexicon after its file was changed"""
+        if lexicon is not self.loaded_lexicon:
+            return
+        if self.loaded_word in removed:
+            self.__set_row_sensitiveness(False)
+        elif self.loaded_word in changed:
+            self.__on_word_changed()
+        self.__update_word_rows(added, removed)
+        self.lexicon_nav_page.set_title(lexicon.name)
+        if len(lexicon) == 0:
+            self.set_property("state", enums.WindowState.EMPTY_WORDS)
+        else:
+            self.set_property("state", enums.WindowState.WORDS)
+            self.update_refs_count()
+
+    def __update_word_rows(self, added: list[Word], removed: list[Word]) -> None:
+        """Remove the rows of the removed words and add rows for the added ones"""
+        for row in list(self.lexicon_list_box):  # pylint: disable=not-an-iterable
+            if row.word in removed:
+                self.lexicon_list_box.remove(row)
+        for word in added:
+            self.lexicon_list_box.append(WordRow(word))
+
     def __on_word_changed(self, *_args) -> None:
         """Handle the word change event"""
         if self.loaded_word is not None:
@@ -549,29 +624,27 @@ class LexiWindow(Adw.ApplicationWindow):
 
     @Gtk.Template.Callback()
     def open_filer_dialog(self, *_args) -> None:
-        def __on_toggled(_check_button: Gtk.CheckButton) -> None:
-            for row in self.filter_dialog_list_box:  # pylint: disable=not-an-iterable
-                is_toggled = row.get_activatable_widget().get_active()
-                word_type = row.get_title()
-
-                if is_toggled:
-                    if word_type not in shared.config["enabled-types"]:
-                        logger.debug("Adding word type to filter: %s", word_type)
-                        shared.config["enabled-types"].append(word_type)
-                        shared.config["enabled-types"].sort()
-                else:
-                    if word_type in shared.config["enabled-types"]:
-                        logger.debug("Removing word type from filter: %s", word_type)
-                        shared.config["enabled-types"].remove(word_type)
-
-            self.lexicon_list_box.invalidate_filter()
+        def __on_toggled(check_button: Gtk.CheckButton, word_type: str) -> None:
+            if check_button.get_active():
+                if word_type in shared.config["enabled-types"]:
+                    return
+                logger.debug("Adding word type to filter: %s", word_type)
+                shared.config["enabled-types"].append(word_type)
+                shared.config["enabled-types"].sort()
+            else:
+                if word_type not in shared.config["enabled-types"]:
+                    return
+                logger.debug("Removing word type from filter: %s", word_type)
+                shared.config["enabled-types"].remove(word_type)
+
+            self.update_types_filter()
 
         def __populate_filter_dialog() -> None:
             for word_type in shared.config["word-types"]:
                 logger.debug("Adding filter for word type: %s", word_type)
                 action_row = Adw.ActionRow(title=word_type, activatable=False)
                 check_button = Gtk.CheckButton()
-                check_button.connect("toggled", __on_toggled)
+                check_button.connect("toggled", __on_toggled, word_type)
                 check_button.set_active(word_type in shared.config["enabled-types"])
                 action_row.set_activatable_widget(check_button)
                 action_row.add_suffix(check_button)
@@ -678,16 +751,30 @@ class LexiWindow(Adw.ApplicationWindow):
         """
         Invalidate the filter for the lexicon list box when the search entry changes
         """
+        self.search_query = parse_query(self.lexicon_search_entry.get_text())
         self.lexicon_list_box.invalidate_filter()
+        # Fuzzy and full-text search results are sorted by their ranks
+        ranked = self.search_query.mode in ("fuzzy", "fulltext")
+        if ranked or self._ranked_sorted:
+            self.lexicon_list_box.invalidate_sort()
+        self._ranked_sorted = ranked
 
     @Gtk.Template.Callback()
     def reset_filters(self, *_args) -> None:
         """Reset all filters in the filter dialog"""
         logger.debug("Resetting filters")
+        # Cleared first, so unchecking the types doesn't refilter the list every time
+        shared.config["enabled-types"].clear()
         for row in self.filter_dialog_list_box:  # pylint: disable=not-an-iterable
             row.get_activatable_widget().set_active(False)
+        self.update_types_filter()
         self.filter_dialog.close()
 
+    def update_types_filter(self) -> None:
+        """Rebuild the bitmask of the enabled types and refilter the words"""
+        self.enabled_types_mask = types_mask(shared.config["enabled-types"])
+        self.lexicon_list_box.invalidate_filter()
+
     def update_refs_count(self) -> None:
         """Update the reference count for all words in the lexicon list box"""
         logger.debug("Updating references count")
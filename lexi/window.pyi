@@ -75,6 +75,7 @@ class LexiWindow(Adw.ApplicationWindow):
 
     sort_method: str
     sort_type: str
+    type_filter_mode: str
 
     # Variables
     loaded_lexicon: Lexicon
@@ -91,6 +92,9 @@ class LexiWindow(Adw.ApplicationWindow):
     def on_sorting_type_changed(
         self, action: Gio.SimpleAction, state: GLib.Variant
     ) -> None: ...
+    def on_type_filter_mode_changed(
+        self, action: Gio.SimpleAction, state: GLib.Variant
+    ) -> None: ...
     def filter_lexicons(self, row: Gtk.ListBoxRow) -> bool: ...
     def sort_words(self, row1: widgets.WordRow, row2: widgets.WordRow) -> int: ...
     def filter_words(self, row: widgets.WordRow) -> bool: ...